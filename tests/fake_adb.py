@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Fake `adb` standing in for several adb servers, one per -P port.
+
+FAKE_ADB_DEVICES names a JSON file {"<port>": [[serial, state], ...]}; `devices`
+prints the table for the requested port (default 5037). Every invocation's argv
+is appended to <file>.argv as one JSON line; other subcommands print nothing.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+table = Path(os.environ["FAKE_ADB_DEVICES"])
+with open(table.with_suffix(".argv"), "a", encoding="utf-8") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\n")
+
+args = sys.argv[1:]
+port = "5037"
+while args and args[0] in ("-H", "-P", "-s"):
+    if args[0] == "-P":
+        port = args[1]
+    args = args[2:]
+
+if args[:1] == ["devices"]:
+    print("List of devices attached")
+    for serial, state in json.loads(table.read_text()).get(port, []):
+        print(f"{serial}\t{state}")
+    print()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Fake `scrcpy` that prints scripted --print-fps lines.
+
+FAKE_SCRCPY_SCRIPT names a JSON file: a list of sessions, each a list of output
+lines. Invocation N (counted in <script>.count) prints session N and exits 0;
+each invocation's argv is appended to <script>.argv as one JSON line.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+script = Path(os.environ["FAKE_SCRCPY_SCRIPT"])
+counter = script.with_suffix(".count")
+n = int(counter.read_text()) if counter.exists() else 0
+counter.write_text(str(n + 1))
+with open(script.with_suffix(".argv"), "a", encoding="utf-8") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\n")
+
+sessions = json.loads(script.read_text())
+print("scrcpy 2.4 <https://github.com/Genymobile/scrcpy>", flush=True)
+for line in sessions[min(n, len(sessions) - 1)]:
+    print(line, flush=True)
+sys.exit(0)
@@ -0,0 +1,78 @@
+"""Adaptive bitrate supervision driven through a fake scrcpy (tests/fake_scrcpy.py)."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import wifi_adb  # noqa: E402
+
+
+def fps_lines(fps: int, count: int) -> list[str]:
+    return [f"INFO: {fps} fps"] * count
+
+
+@unittest.skipIf(os.name == "nt", "fake scrcpy is installed as an executable shim")
+class AdaptiveBitrateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        shim = self.tmp / "scrcpy"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{HERE / "fake_scrcpy.py"}" "$@"\n')
+        shim.chmod(0o755)
+        self.script = self.tmp / "fps.json"
+        self.telemetry = self.tmp / "telemetry.ndjson"
+        patches = [
+            mock.patch.dict(os.environ, {"PATH": f"{self.tmp}{os.pathsep}{os.environ.get('PATH', '')}",
+                                         "FAKE_SCRCPY_SCRIPT": str(self.script)}),
+            mock.patch.object(wifi_adb, "FILE_TELEMETRY", str(self.telemetry)),
+            mock.patch.object(wifi_adb, "ADB_SERVERS", []),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def launch(self, sessions: list[list[str]], opts: list[str], target_fps: int) -> int | None:
+        self.script.write_text(json.dumps(sessions))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return wifi_adb.launch_scrcpy("10.0.0.5:5555", opts, target_fps)
+
+    def test_steps_down_then_back_up(self):
+        ctl = wifi_adb.BitrateController(2, 50)
+        warmup, down, up = ctl.warmup, ctl.down_window, ctl.up_window * 2  # preset 2 failed once
+        sessions = [
+            fps_lines(60, warmup) + fps_lines(20, down) + fps_lines(60, 5),  # Default: starves -> down
+            fps_lines(60, warmup) + fps_lines(60, up) + fps_lines(60, 5),  # Low: stable -> up
+            fps_lines(60, warmup) + fps_lines(60, 3),  # Default again; window closed
+        ]
+        code = self.launch(sessions, wifi_adb.preset_opts(2) + ["--print-fps"], 50)
+        self.assertEqual(code, 0)
+
+        argvs = [json.loads(x) for x in self.script.with_suffix(".argv").read_text().splitlines()]
+        expected = [wifi_adb.preset_opts(n) + ["--print-fps"] for n in (2, 1, 2)]
+        self.assertEqual([a[2:] for a in argvs], expected)
+        self.assertTrue(all(a[:2] == ["-s", "10.0.0.5:5555"] for a in argvs))
+
+        rows = [json.loads(x) for x in self.telemetry.read_text().splitlines()]
+        switches = [(r["action"], r["to_preset"]) for r in rows if r["type"] == "switch"]
+        self.assertEqual(switches, [("down", "Low"), ("up", "Default")])
+        self.assertEqual([r["preset"] for r in rows if r["type"] == "session"], ["Default", "Low", "Default"])
+
+    def test_idle_screen_does_not_step_down(self):
+        sessions = [fps_lines(60, 2) + fps_lines(0, 20) + fps_lines(60, 3)]
+        code = self.launch(sessions, wifi_adb.preset_opts(2) + ["--print-fps"], 50)
+        self.assertEqual(code, 0)
+        rows = [json.loads(x) for x in self.telemetry.read_text().splitlines()]
+        self.assertFalse([r for r in rows if r["type"] == "switch"])
+        self.assertEqual(len(self.script.with_suffix(".argv").read_text().splitlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
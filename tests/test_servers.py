@@ -0,0 +1,118 @@
+"""Multi-server aggregation against a fake adb serving one device table per port (tests/fake_adb.py)."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import wifi_adb  # noqa: E402
+
+A, B = "127.0.0.1:5037", "127.0.0.1:6000"
+EP = "10.0.0.5:5555"
+
+
+@unittest.skipIf(os.name == "nt", "fake adb is installed as an executable shim")
+class ServerAggregationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        shim = self.tmp / "adb"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{HERE / "fake_adb.py"}" "$@"\n')
+        shim.chmod(0o755)
+        self.table = self.tmp / "devices.json"
+        patches = [
+            mock.patch.dict(os.environ, {"PATH": f"{self.tmp}{os.pathsep}{os.environ.get('PATH', '')}",
+                                         "FAKE_ADB_DEVICES": str(self.table)}),
+            mock.patch.object(wifi_adb, "ADB_SERVERS", [A, B]),
+            mock.patch.dict(wifi_adb._device_server, clear=True),
+            mock.patch.object(wifi_adb, "FILE_SETUP", str(self.tmp / "setup.json")),
+            mock.patch.object(wifi_adb, "FILE_CONN", str(self.tmp / "connect.json")),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def servers(self, tables: dict[str, list[list[str]]]):
+        self.table.write_text(json.dumps(tables))
+
+    def test_online_server_owns_device_reported_offline_first(self):
+        self.servers({"5037": [[EP, "offline"]], "6000": [[EP, "device"]]})
+        rows = wifi_adb.adb_devices_by_server()
+        self.assertEqual(sorted(rows), sorted([(A, EP, "offline"), (B, EP, "device")]))
+        self.assertEqual(wifi_adb.server_of(EP), B)
+        self.assertEqual(wifi_adb.adb_base(EP), ["adb", "-H", "127.0.0.1", "-P", "6000", "-s", EP])
+
+        view = [r for r in wifi_adb.merged_server_view() if r["endpoint"] == EP]
+        self.assertEqual(len(view), 1)
+        self.assertEqual((view[0]["server"], view[0]["state"]), (B, "device"))
+
+    def test_offline_everywhere_falls_back_to_first_reporter(self):
+        self.servers({"5037": [], "6000": [[EP, "offline"]]})
+        wifi_adb.adb_devices_by_server()
+        self.assertEqual(wifi_adb.server_of(EP), B)
+        self.servers({"5037": [[EP, "unauthorized"]], "6000": [[EP, "offline"]]})
+        wifi_adb.adb_devices_by_server()
+        self.assertEqual(wifi_adb.server_of(EP), A)
+
+    def test_owner_follows_device_between_servers(self):
+        self.servers({"5037": [[EP, "device"]], "6000": [[EP, "offline"]]})
+        wifi_adb.adb_devices_by_server()
+        self.assertEqual(wifi_adb.server_of(EP), A)
+        self.servers({"5037": [[EP, "offline"]], "6000": [[EP, "device"]]})
+        wifi_adb.adb_devices_by_server()
+        self.assertEqual(wifi_adb.server_of(EP), B)
+
+    def test_inventory_rows_take_state_from_owner(self):
+        Path(wifi_adb.FILE_SETUP).write_text(json.dumps([{"serial": "S1", "model": "Pixel", "ip": "10.0.0.5", "endpoint": EP}]))
+        self.servers({"5037": [[EP, "offline"], ["USB1", "device"]], "6000": [[EP, "device"]]})
+        rows = {r["endpoint"]: r for r in wifi_adb.merged_server_view()}
+        self.assertEqual((rows[EP]["server"], rows[EP]["state"], rows[EP]["source"]), (B, "device", "setup.json"))
+        self.assertEqual((rows["USB1"]["server"], rows["USB1"]["state"]), (A, "device"))
+
+    def test_dashboard_reports_owner_state(self):
+        self.servers({"5037": [[EP, "device"]], "6000": [[EP, "offline"]]})  # owner listed first
+        self.assertEqual(wifi_adb.device_states(), {EP: "device"})
+        dash = wifi_adb.Dashboard([{"endpoint": EP, "model": "Pixel"}], interval=0.05, slow_interval=3600)
+        with mock.patch.object(wifi_adb, "tcp_rtt_ms", return_value=None):
+            poller = threading.Thread(target=dash._poll)
+            poller.start()
+            try:
+                deadline = time.monotonic() + 5
+                while dash.data[EP]["state"] == "..." and time.monotonic() < deadline:
+                    time.sleep(0.02)
+            finally:
+                dash._stop.set()
+                poller.join()
+        self.assertEqual(dash.data[EP]["state"], "device")
+
+    def test_metrics_collector_reports_owner_state(self):
+        self.servers({"5037": [[EP, "device"]], "6000": [[EP, "offline"]]})
+        collector = wifi_adb.FleetCollector([{"endpoint": EP, "model": "Pixel"}], 5, 3600, 2, reconnect=True)
+        with mock.patch.object(wifi_adb, "tcp_rtt_ms", return_value=None), \
+                mock.patch.object(wifi_adb, "ensure_connected", side_effect=AssertionError("reconnect")), \
+                ThreadPoolExecutor(max_workers=2) as pool:
+            collector._tick(pool, slow=False)
+        self.assertEqual(wifi_adb.server_of(EP), A)
+        self.assertEqual(collector.devices[EP]["state"], "device")
+        self.assertIn(f'wifi_adb_device_up{{endpoint="{EP}",model="Pixel",server="{A}"}} 1', collector.render())
+
+    def test_remote_endpoint_skips_arp_resolution(self):
+        Path(wifi_adb.FILE_SETUP).write_text(json.dumps([{
+            "serial": "S1", "model": "Pixel", "ip": "10.0.0.5", "endpoint": EP,
+            "mac": "aa:bb:cc:dd:ee:ff", "server": "10.9.9.9:5037",
+        }]))
+        with mock.patch.object(wifi_adb, "read_arp_table", side_effect=AssertionError("ARP read")), \
+                mock.patch.object(wifi_adb, "sweep_subnet", side_effect=AssertionError("sweep")):
+            self.assertEqual(wifi_adb.resolve_endpoint(EP), EP)
+
+
+if __name__ == "__main__":
+    unittest.main()
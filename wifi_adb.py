@@ -10,6 +10,18 @@ Features:
 - usb-back   : switch all TCP devices back to USB mode
 - disconnect : disconnect all ADB TCP endpoints
 - pair       : Wireless debugging pairing (Android 11+)
+- exec       : run one `adb shell` command across many inventory devices in parallel
+- push       : copy a file to many devices in parallel (skip if size + hash already match)
+- install    : install an APK on many devices in parallel
+- dashboard  : live device table (state, battery, SSID, RTT) with in-place redraw
+- mirror     : launch scrcpy non-interactively (preset, telemetry, adaptive bitrate)
+- snapshot   : concurrent screenshots -> per-device thumbnails + one contact sheet PNG
+- logcat     : stream logcat from many devices into rotating per-device files
+- metrics    : daemon serving Prometheus metrics (device health + adb command latency)
+
+Global options (before the subcommand):
+- --servers host:port,...  aggregate several adb servers (like adb -H/-P); also WIFI_ADB_SERVERS
+- --prewarm                 pre-connect recent devices in the background (menu only)
 
 Notes:
 - Requires `adb` in PATH. Optional: `scrcpy` for mirroring.
@@ -24,8 +36,23 @@ import sys
 import re
 import json
 import time
+import queue
+import uuid
+import gzip
+import zlib
+import asyncio
+import http.server
+import math
+import struct
+import atexit
+import shlex
 import shutil
+import socket
+import hashlib
+import argparse
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -36,6 +63,27 @@ FILE_SETUP = "wifi_device_setup.json"
 FILE_CONN = "wifi_device_connect.json"
 DEFAULT_IP = "192.168.43.1"
 DEFAULT_ADB_PORT = 5555  # NEW: default ADB Wi‑Fi port (customizable)
+DEFAULT_JOBS = 8  # default concurrency for fleet-wide commands (exec, ...)
+DEFAULT_SSID_JOBS = 4  # per-SSID cap for transfers so one AP isn't saturated
+DEFAULT_RETRIES = 2
+PROGRESS_EVERY = 10  # seconds between in-flight progress lines during push/install
+FILE_TELEMETRY = "scrcpy_telemetry.ndjson"  # appended per-session FPS samples (NDJSON)
+PREWARM_COUNT = 5  # most recently used endpoints warmed by `--prewarm`
+PREWARM_JOBS = 3
+PREWARM_TTL = 300  # seconds a warmed device's props are trusted
+PREWARM_WAIT = 5  # max seconds a connect waits for that device's in-flight warm-up
+SHELL_IDLE = 60  # close a device's persistent shell channel after this many idle seconds
+SHELL_TIMEOUT = 30  # max seconds to wait for one command on a shell channel
+SHELL_MAX_CHANNELS = 32  # open shell channels kept at once; least recently used idle ones are closed
+DEFAULT_ADB_SERVER_PORT = 5037
+DIR_SNAPSHOTS = "snapshots"  # contact_sheet.png + thumbs/<endpoint>.png
+DIR_LOGCAT = "logcat"  # <endpoint>/logcat.log (+ rotated logcat.N.log[.gz])
+DEFAULT_METRICS_PORT = 9137
+RECONNECT_BACKOFF = (30, 600)  # metrics --reconnect: first retry delay, cap (doubles per failure)
+
+# adb servers to aggregate ("host:port", like adb -H/-P; "local" = this host's default server).
+# Set with --servers a:5037,b:5037 or the WIFI_ADB_SERVERS environment variable.
+ADB_SERVERS: list[str] = [x.strip() for x in os.environ.get("WIFI_ADB_SERVERS", "").split(",") if x.strip()]
 
 # ANSI colors (auto-disable if not TTY)
 class Colors:
@@ -77,6 +125,23 @@ if os.name == "nt":
 # Helpers
 # ----------------------------------------------------------------------------
 
+# Serializes console output from worker threads so prefixed lines never interleave
+_print_lock = threading.Lock()
+
+
+def tprint(*args, **kwargs):
+    """Thread-safe print (used by fleet-wide parallel commands)."""
+    with _print_lock:
+        print(*args, **kwargs, flush=True)
+
+
+def clear_screen():
+    if Colors.enabled:
+        print("\x1b[H\x1b[2J", end="", flush=True)
+    else:
+        os.system("cls" if os.name == "nt" else "clear")
+
+
 def bar():
     print(Colors.c("="*59, Colors.BAR))
 
@@ -84,8 +149,59 @@ def sep():
     print(Colors.c("-"*59, Colors.BAR))
 
 
+class CommandMetrics:
+    """Latency histogram + failure count per adb subcommand, fed by run() and the shell channel."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hist: dict[str, list] = {}  # cmd -> [bucket counts..., +Inf count, sum]
+        self.failures: dict[str, int] = {}
+
+    @staticmethod
+    def label(cmd) -> str | None:
+        """adb subcommand name for an argv ("devices", "shell", ...); None if not adb."""
+        if not isinstance(cmd, (list, tuple)) or not cmd or Path(str(cmd[0])).stem.lower() != "adb":
+            return None
+        i = 1
+        while i < len(cmd) and cmd[i] in ("-H", "-P", "-s"):
+            i += 2
+        return str(cmd[i]) if i < len(cmd) else "adb"
+
+    def observe(self, name: str, secs: float, failed: bool):
+        with self._lock:
+            h = self.hist.get(name)
+            if h is None:
+                h = self.hist[name] = [0] * (len(self.BUCKETS) + 1) + [0.0]
+            for i, le in enumerate(self.BUCKETS):
+                if secs <= le:
+                    h[i] += 1
+            h[len(self.BUCKETS)] += 1
+            h[-1] += secs
+            if failed:
+                self.failures[name] = self.failures.get(name, 0) + 1
+            else:
+                self.failures.setdefault(name, 0)
+
+    def snapshot(self) -> tuple[dict[str, list], dict[str, int]]:
+        """Copies of (histograms, failure counts), taken under the lock."""
+        with self._lock:
+            return {k: list(v) for k, v in self.hist.items()}, dict(self.failures)
+
+    def observe_run(self, cmd, secs: float, code: int):
+        name = self.label(cmd)
+        if name:
+            # A shell's exit code belongs to the remote command; only adb-level errors count
+            self.observe(name, secs, code in (127, 255) if name == "shell" else code != 0)
+
+
+COMMAND_METRICS = CommandMetrics()
+
+
 def run(cmd, input_text=None, check=False, capture=True, shell=False):
     """Run a subprocess and return (code, stdout, stderr)."""
+    t0 = time.perf_counter()
     try:
         if capture:
             proc = subprocess.run(
@@ -101,10 +217,12 @@ def run(cmd, input_text=None, check=False, capture=True, shell=False):
             proc = subprocess.run(cmd, shell=shell)
             out = ""
             err = ""
+        COMMAND_METRICS.observe_run(cmd, time.perf_counter() - t0, proc.returncode)
         if check and proc.returncode != 0:
             raise subprocess.CalledProcessError(proc.returncode, cmd, out, err)
         return proc.returncode, out, err
     except FileNotFoundError:
+        COMMAND_METRICS.observe_run(cmd, time.perf_counter() - t0, 127)
         return 127, "", f"Command not found: {cmd}"
 
 
@@ -227,6 +345,49 @@ def append_if_device_model_missing(path: Path, entry: dict):
 # ADB helpers
 # ----------------------------------------------------------------------------
 
+def server_addr(server: str) -> tuple[str, int] | None:
+    """(host, port) for a server spec; None for the local default server."""
+    if not server or server == "local":
+        return None
+    host, _, port = server.rpartition(":")
+    if not host:
+        host, port = server, ""
+    return host, int(port) if port.isdigit() else DEFAULT_ADB_SERVER_PORT
+
+
+def server_label(server: str) -> str:
+    return server if server_addr(server) else "local"
+
+
+# serial/endpoint -> adb server it was last seen on (live `devices` wins over inventory)
+_device_server: dict[str, str] = {}
+
+
+def server_of(serial: str | None) -> str:
+    if serial and serial in _device_server:
+        return _device_server[serial]
+    return ADB_SERVERS[0] if ADB_SERVERS else ""
+
+
+def adb_base(serial: str | None = None, server: str | None = None) -> list[str]:
+    """`adb [-H host -P port] [-s serial]` routed to the server that owns serial."""
+    addr = server_addr(server if server is not None else server_of(serial))
+    cmd = ["adb"]
+    if addr:
+        cmd += ["-H", addr[0], "-P", str(addr[1])]
+    if serial:
+        cmd += ["-s", serial]
+    return cmd
+
+
+def adb_env(serial: str) -> dict | None:
+    """Environment pointing child tools (scrcpy) at serial's adb server, or None if local."""
+    addr = server_addr(server_of(serial))
+    if not addr:
+        return None
+    return dict(os.environ, ADB_SERVER_SOCKET=f"tcp:{addr[0]}:{addr[1]}")
+
+
 def ensure_adb():
     while not which("adb"):
         print(Colors.c("[ERROR]", Colors.ERR), "adb not found in PATH")
@@ -236,11 +397,12 @@ def ensure_adb():
             time.sleep(5)
         except KeyboardInterrupt:
             sys.exit(1)
-    run(["adb", "start-server"])  # best effort
+    if not ADB_SERVERS or any(not server_addr(x) for x in ADB_SERVERS):
+        run(["adb", "start-server"])  # best effort
 
 
-def adb_devices() -> list[tuple[str, str]]:
-    code, out, _ = run(["adb", "devices"])
+def _server_devices(server: str) -> list[tuple[str, str]]:
+    code, out, _ = run([*adb_base(server=server), "devices"])
     lines = out.splitlines()[1:]  # skip header
     pairs = []
     for ln in lines:
@@ -253,6 +415,38 @@ def adb_devices() -> list[tuple[str, str]]:
     return pairs
 
 
+def adb_devices_by_server() -> list[tuple[str, str, str]]:
+    """(server, serial, state) from every configured adb server, queried concurrently."""
+    servers = ADB_SERVERS or [""]
+    if len(servers) == 1:
+        tables = [_server_devices(servers[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            tables = list(pool.map(_server_devices, servers))
+    rows = []
+    online: dict[str, str] = {}
+    reported: dict[str, str] = {}
+    for server, pairs in zip(servers, tables):
+        for serial, state in pairs:
+            rows.append((server, serial, state))
+            reported.setdefault(serial, server)
+            if state == "device":
+                online.setdefault(serial, server)
+    # First server with the serial online owns it; otherwise the first one reporting it at all
+    for serial, server in reported.items():
+        _device_server[serial] = online.get(serial, server)
+    return rows
+
+
+def adb_devices() -> list[tuple[str, str]]:
+    return [(serial, state) for _server, serial, state in adb_devices_by_server()]
+
+
+def device_states() -> dict[str, str]:
+    """{serial: state} as reported by each serial's owning server (one `devices` call per server)."""
+    return {serial: state for server, serial, state in adb_devices_by_server() if server == server_of(serial)}
+
+
 def usb_serials_only() -> list[str]:
     # Exclude endpoints like host:port
     ser = []
@@ -263,14 +457,176 @@ def usb_serials_only() -> list[str]:
 
 
 def adb_get_state(serial: str) -> str:
-    _, out, _ = run(["adb", "-s", serial, "get-state"])  # returns "device" on success
+    _, out, _ = run([*adb_base(serial), "get-state"])  # returns "device" on success
     return out.strip()
 
 
+class ShellChannel:
+    """One long-lived `adb shell` per device; commands are framed by sentinel lines.
+
+    Each command is sent as `( eval 'cmd' ) </dev/null 2>/dev/null` followed by an echo
+    of a unique marker and the exit code, so output can be split without spawning a
+    new adb client (and transport handshake) per call. The quoted eval in a subshell
+    makes syntax errors and `exit` fail just that command, as a one-off `adb shell`
+    would. stdout is drained by a reader thread into a queue so reads can time out
+    on a silently dropped link.
+    """
+
+    def __init__(self, serial: str):
+        self.serial = serial
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self._token = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._lines: queue.Queue = queue.Queue()
+        self.proc = subprocess.Popen(
+            [*adb_base(serial), "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        for raw in self.proc.stdout:
+            self._lines.put(raw)
+        self._lines.put(None)  # EOF: adb exited (transport reset, device gone)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def execute(self, command: str, timeout: float | None = None) -> tuple[int, str] | None:
+        """Run command; return (exit code, stdout) or None if the channel broke.
+
+        Raises TimeoutError if no result arrives within timeout (default SHELL_TIMEOUT);
+        the command may still be running, so the channel must not be reused.
+        """
+        self._seq += 1
+        mark = f"__WADB_{self._token}_{self._seq}__"
+        script = f"( eval {shlex.quote(command)}\n) </dev/null 2>/dev/null; __rc=$?; echo; echo {mark} $__rc\n"
+        try:
+            self.proc.stdin.write(script.encode())
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            return None
+        chunks: list[bytes] = []
+        deadline = time.monotonic() + (SHELL_TIMEOUT if timeout is None else timeout)
+        while True:
+            try:
+                raw = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError(command) from None
+            if raw is None:
+                return None
+            line = raw.decode(errors="ignore").rstrip("\r\n")
+            if line.startswith(mark):
+                rc = line[len(mark):].strip()
+                self.last_used = time.monotonic()
+                out = b"".join(chunks).decode(errors="ignore")
+                # Drop the newline our own `echo` added before the marker
+                return (int(rc) if rc.lstrip("-").isdigit() else 1), out[:-1] if out.endswith("\n") else out
+            chunks.append(raw)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+_channels: dict[str, ShellChannel] = {}
+_channels_lock = threading.Lock()
+_reaper_started = False
+
+
+def _reap_idle_channels():
+    while True:
+        time.sleep(5)
+        now = time.monotonic()
+        with _channels_lock:
+            idle = [s for s, ch in _channels.items() if now - ch.last_used > SHELL_IDLE and not ch.lock.locked()]
+            stale = [_channels.pop(s) for s in idle]
+        for ch in stale:
+            ch.close()
+
+
+def _get_channel(serial: str) -> ShellChannel | None:
+    global _reaper_started
+    evicted: list[ShellChannel] = []
+    try:
+        with _channels_lock:
+            ch = _channels.get(serial)
+            if ch and ch.alive():
+                ch.last_used = time.monotonic()
+                return ch
+            if ch:
+                evicted.append(_channels.pop(serial))  # adb exited; reap its pipes
+            # Cap open adb clients (dashboards poll hundreds of devices): close LRU idle channels
+            idle = sorted((c for c in _channels.values() if not c.lock.locked()), key=lambda c: c.last_used)
+            for c in idle[:max(0, len(_channels) + 1 - SHELL_MAX_CHANNELS)]:
+                evicted.append(_channels.pop(c.serial))
+            try:
+                ch = _channels[serial] = ShellChannel(serial)
+            except FileNotFoundError:
+                return None
+            if not _reaper_started:
+                _reaper_started = True
+                threading.Thread(target=_reap_idle_channels, daemon=True).start()
+            return ch
+    finally:
+        for c in evicted:
+            c.close()
+
+
+def close_shell(serial: str | None = None):
+    """Close one device's shell channel (e.g. after tcpip/disconnect), or all of them."""
+    with _channels_lock:
+        chans = list(_channels.values()) if serial is None else [c for c in [_channels.get(serial)] if c]
+        for ch in chans:
+            _channels.pop(ch.serial, None)
+    for ch in chans:
+        ch.close()
+
+
+atexit.register(close_shell)
+
+
+def shell_exec(serial: str, command: str, timeout: float | None = None) -> tuple[int, str]:
+    """Run a shell command line on serial via its persistent channel; returns (code, stdout).
+
+    A broken channel (EOF, broken pipe) is reopened once and the command retried; if
+    that fails too, the command runs in a one-off `adb shell` as before. A command
+    that times out is never re-sent: its channel is killed and (124, "") returned.
+    Commands known to run long should use a one-off `adb shell` instead.
+    """
+    for _attempt in range(2):
+        ch = _get_channel(serial)
+        if ch is None:
+            break
+        with ch.lock:
+            t0 = time.perf_counter()
+            try:
+                res = ch.execute(command, timeout)
+            except TimeoutError:
+                COMMAND_METRICS.observe("shell", time.perf_counter() - t0, True)
+                ch.proc.kill()
+                close_shell(serial)
+                return 124, ""
+        COMMAND_METRICS.observe("shell", time.perf_counter() - t0, res is None)
+        if res is not None:
+            return res
+        close_shell(serial)
+    code, out, _ = run([*adb_base(serial), "shell", command])
+    return code, out
+
+
 def adb_shell(serial: str, *args: str) -> str:
-    cmd = ["adb", "-s", serial, "shell", *args]
-    _, out, _ = run(cmd)
-    return out
+    # Each arg is one word on the remote side (paths with spaces, quotes, `sh -c` scripts)
+    return shell_exec(serial, " ".join(shlex.quote(a) for a in args))[1]
 
 
 def parse_first(out: str) -> str:
@@ -318,6 +674,35 @@ def get_wifi_ip(serial: str) -> str:
     return ""
 
 
+def parse_battery(batt_out: str) -> str:
+    """Battery level from `dumpsys battery` ("" if unknown)."""
+    m = re.search(r"^\s*level:\s*(\d+)", batt_out, re.M)
+    return m.group(1) if m else ""
+
+
+def parse_ssid(wifi_out: str) -> str:
+    """Current SSID from `dumpsys wifi` ("" if unknown)."""
+    ssid = ""
+    m = re.search(r"mWifiInfo SSID:\s*(.*)", wifi_out)
+    if not m:
+        m = re.search(r"\bSSID:\s*(.*)", wifi_out)
+    if m:
+        ssid = m.group(1).split(",")[0].strip().strip('"')
+        if ssid.lower() == "<unknown ssid>" or ssid == "=":
+            ssid = ""
+    return ssid
+
+
+def get_wifi_mac(serial: str) -> str:
+    """Wi‑Fi MAC of wlan0 as lowercase aa:bb:.. ("" if unavailable)."""
+    out = adb_shell(serial, "ip", "-o", "link", "show", "wlan0")
+    m = re.search(r"link/ether\s+([0-9a-fA-F:]{17})", out)
+    if not m:
+        m = re.search(r"\b([0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})\b", adb_shell(serial, "cat", "/sys/class/net/wlan0/address"))
+    mac = m.group(1).lower() if m else ""
+    return "" if mac == "00:00:00:00:00:00" else mac
+
+
 def device_props(serial: str) -> dict:
     props = {}
     props["model"] = parse_first(adb_shell(serial, "getprop", "ro.product.model"))
@@ -336,25 +721,15 @@ def device_props(serial: str) -> dict:
     props["dpi"] = m.group(1) if m else ""
 
     # Battery level
-    batt_out = adb_shell(serial, "dumpsys", "battery")
-    m = re.search(r"^\s*level:\s*(\d+)", batt_out, re.M)
-    props["battery"] = m.group(1) if m else ""
+    props["battery"] = parse_battery(adb_shell(serial, "dumpsys", "battery"))
 
     # SSID
-    wifi_out = adb_shell(serial, "dumpsys", "wifi")
-    ssid = ""
-    m = re.search(r"mWifiInfo SSID:\s*(.*)", wifi_out)
-    if not m:
-        m = re.search(r"\bSSID:\s*(.*)", wifi_out)
-    if m:
-        ssid = m.group(1).split(",")[0].strip().strip('"')
-        if ssid.lower() == "<unknown ssid>" or ssid == "=":
-            ssid = ""
-    props["ssid"] = ssid or None
+    props["ssid"] = parse_ssid(adb_shell(serial, "dumpsys", "wifi")) or None
 
     # IP
     ip = get_wifi_ip(serial)
     props["ip"] = ip or None
+    props["mac"] = get_wifi_mac(serial) or None
 
     # Endpoint (default uses DEFAULT_ADB_PORT; actual connected port may differ)
     if ip:
@@ -365,8 +740,9 @@ def device_props(serial: str) -> dict:
     return props
 
 
-def print_device_info(serial: str) -> dict:
-    info = device_props(serial)
+def print_device_info(serial: str, info: dict | None = None) -> dict:
+    if info is None:
+        info = device_props(serial)
     print()
     sep()
     print("BRAND      :", info.get("brand", ""))
@@ -386,12 +762,26 @@ def print_device_info(serial: str) -> dict:
     else:
         print("WIFI_IP    : not available")
         print("ADB_TCP    :", serial)
+    print("WIFI_MAC   :", info.get("mac") or "not available")
     sep()
     print()
     return info
 
 
+_stay_awake_locks: dict[str, threading.Lock] = {}
+_stay_awake_guard = threading.Lock()
+
+
 def check_stay_awake_support(serial: str) -> bool:
+    # One probe per device at a time: two overlapping probes (pre-warmer + connect) could
+    # read each other's temporary "7" and leave it in place when "reverting"
+    with _stay_awake_guard:
+        lock = _stay_awake_locks.setdefault(serial, threading.Lock())
+    with lock:
+        return _check_stay_awake_support(serial)
+
+
+def _check_stay_awake_support(serial: str) -> bool:
     curr = parse_first(adb_shell(serial, "settings", "get", "global", "stay_on_while_plugged_in")) or "0"
     adb_shell(serial, "settings", "put", "global", "stay_on_while_plugged_in", "7")
     now = parse_first(adb_shell(serial, "settings", "get", "global", "stay_on_while_plugged_in"))
@@ -401,6 +791,100 @@ def check_stay_awake_support(serial: str) -> bool:
     return ok
 
 
+# ----------------------------------------------------------------------------
+# Neighbour table (ARP) resolution — find a device's current IP from its MAC
+# ----------------------------------------------------------------------------
+
+def norm_mac(mac: str) -> str:
+    """Normalize aa-bb-.. / a:b:.. to aa:bb:cc:dd:ee:ff ("" if not a MAC)."""
+    parts = re.split(r"[:-]", (mac or "").strip().lower())
+    if len(parts) != 6 or not all(re.fullmatch(r"[0-9a-f]{1,2}", p) for p in parts):
+        return ""
+    return ":".join(p.zfill(2) for p in parts)
+
+
+def read_arp_table() -> dict[str, str]:
+    """Host neighbour table as {mac: ip}; /proc/net/arp on Linux, `arp -a` elsewhere."""
+    table: dict[str, str] = {}
+    proc_arp = Path("/proc/net/arp")
+    if proc_arp.exists():
+        for line in proc_arp.read_text(errors="ignore").splitlines()[1:]:
+            cols = line.split()
+            # IP, HW type, Flags, HW address, Mask, Device; flags 0x0 = incomplete
+            if len(cols) >= 4 and cols[2] != "0x0":
+                mac = norm_mac(cols[3])
+                if mac and mac != "00:00:00:00:00:00":
+                    table[mac] = cols[0]
+        return table
+    _, out, _ = run(["arp", "-a"])
+    for line in out.splitlines():
+        ip = re.search(r"\b(\d{1,3}(?:\.\d{1,3}){3})\b", line)
+        mac = re.search(r"\b([0-9a-fA-F]{1,2}(?:[:-][0-9a-fA-F]{1,2}){5})\b", line)
+        if ip and mac and norm_mac(mac.group(1)):
+            table[norm_mac(mac.group(1))] = ip.group(1)
+    return table
+
+
+def sweep_subnet(ip: str, port: int, timeout: float = 0.3, jobs: int = 64):
+    """Touch every host in ip's /24 so the kernel fills its neighbour table."""
+    prefix = ip.rsplit(".", 1)[0]
+
+    def touch(host: str):
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                pass
+        except OSError:
+            pass
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(touch, (f"{prefix}.{i}" for i in range(1, 255))))
+
+
+def update_endpoint_by_mac(mac: str, new_ip: str, port: str):
+    """Rewrite ip/endpoint of every inventory entry with this MAC."""
+    for path in (Path(FILE_SETUP), Path(FILE_CONN)):
+        items = load_json_flexible(path)
+        changed = False
+        for obj in items:
+            if norm_mac(obj.get("mac") or "") == mac:
+                obj["ip"] = new_ip
+                obj["endpoint"] = f"{new_ip}:{port}"
+                changed = True
+        if changed:
+            save_json_array(path, items)
+
+
+def resolve_endpoint(endpoint: str, sweep: bool = True) -> str:
+    """Return the current endpoint for a known device, following DHCP moves via its MAC.
+
+    Looks the recorded MAC up in the host neighbour table (instant); on a miss,
+    sweeps the old /24 once and looks again. A moved device has its inventory
+    entries rewritten. Unknown endpoints, and those owned by a remote adb server,
+    are returned unchanged.
+    """
+    host, _, port = endpoint.rpartition(":")
+    if not host or not port.isdigit():
+        return endpoint
+    rec = next((r for r in build_combined_list() if r["endpoint"] == endpoint and r.get("mac")), None)
+    if not rec:
+        return endpoint
+    addr = server_addr(server_of(endpoint))  # live owner, else the server recorded in the inventory
+    if addr and addr[0] not in ("localhost", "127.0.0.1"):
+        return endpoint  # a remote server's LAN isn't in this host's neighbour table
+    mac = norm_mac(rec["mac"])
+    ip = read_arp_table().get(mac)
+    if not ip and sweep:
+        print(Colors.c("[ARP]", Colors.INFO), f"{mac} not in neighbour table; sweeping {host.rsplit('.', 1)[0]}.0/24 ...")
+        sweep_subnet(host, int(port))
+        ip = read_arp_table().get(mac)
+    if not ip or ip == host:
+        return endpoint
+    new_ep = f"{ip}:{port}"
+    print(Colors.c("[ARP]", Colors.NOTE), f"{rec.get('model') or mac} moved {endpoint} -> {new_ep}; inventory updated.")
+    update_endpoint_by_mac(mac, ip, port)
+    return new_ep
+
+
 # ----------------------------------------------------------------------------
 # Core commands
 # ----------------------------------------------------------------------------
@@ -437,12 +921,13 @@ def cmd_setup():
         print(f"Initializing {idx}/{len(serials)}  SERIAL: {ser}")
         usb_state = adb_get_state(ser)
 
-        brand = model = devname = ver = sdk = size = dpi = batt = ssid_cur = ip_cur = endp_cur = ""
+        brand = model = devname = ver = sdk = size = dpi = batt = ssid_cur = ip_cur = endp_cur = mac_cur = ""
 
         if usb_state == "device":
             # Use chosen port instead of hardcoded 5555
-            run(["adb", "-s", ser, "tcpip", port_str])  # ignore errors
-            run(["adb", "-s", ser, "wait-for-device"])  # ignore
+            run([*adb_base(ser), "tcpip", port_str])  # ignore errors
+            close_shell(ser)  # adbd restarts; reopen the channel on next use
+            run([*adb_base(ser), "wait-for-device"])  # ignore
 
             ip_cur = get_wifi_ip(ser)
 
@@ -457,14 +942,18 @@ def cmd_setup():
             dpi = props.get("dpi", "")
             batt = props.get("battery", "")
             ssid_cur = props.get("ssid", None) or ""
+            mac_cur = props.get("mac", None) or ""
 
             if ip_cur:
                 endp_cur = f"{ip_cur}:{port_str}"
                 if ip_cur in seen_ips:
                     dup_ip = True
                 seen_ips.add(ip_cur)
-                run(["adb", "disconnect", endp_cur])
-                run(["adb", "connect", endp_cur])
+                close_shell(endp_cur)
+                # The bench host that has the phone on USB also owns its Wi‑Fi endpoint
+                _device_server[endp_cur] = server_of(ser)
+                run([*adb_base(server=server_of(ser)), "disconnect", endp_cur])
+                run([*adb_base(server=server_of(ser)), "connect", endp_cur])
         else:
             print(Colors.c("[USB]", Colors.ERR), "Device is not ready over USB right now")
 
@@ -482,6 +971,7 @@ def cmd_setup():
         else:
             print("WIFI_IP    : not available")
             print("ADB_TCP    : not available")
+        print("WIFI_MAC   :", mac_cur or "not available")
 
         model_a[idx] = model
         ip_a[idx] = ip_cur
@@ -500,7 +990,9 @@ def cmd_setup():
             "battery": batt or None,
             "ssid": ssid_cur or None,
             "ip": ip_cur or None,
+            "mac": mac_cur or None,
             "endpoint": endp_cur or None,
+            "server": server_of(ser) or None,
         }
         append_or_replace_by_ip(setup_path, entry)
 
@@ -528,37 +1020,36 @@ def cmd_setup():
     print(f'Data saved to "{FILE_SETUP}"')
 
 
+# (name, --video-bit-rate, --max-size); menu numbers are 1-based indexes
+SCRCPY_PRESETS = [
+    ("Low", "2M", "800"),
+    ("Default", "8M", "1080"),
+    ("High", "16M", "1440"),
+    ("Very High", "24M", "1440"),
+    ("Ultra", "32M", "2160"),
+    ("Extreme", "64M", "2160"),
+    ("Insane", "72M", "2160"),
+]
+DEFAULT_PRESET = 2
+
+
+def preset_opts(num: int) -> list[str]:
+    _name, rate, size = SCRCPY_PRESETS[num - 1]
+    return ["--video-bit-rate", rate, "--max-size", size]
+
+
 def pick_scrcpy_opts(stay_awake_ok: bool) -> list[str]:
     print()
     print("Choose scrcpy preset:")
-    print("  [1] Low        : --video-bit-rate 2M   --max-size 800")
-    print("  [2] Default    : --video-bit-rate 8M   --max-size 1080")
-    print("  [3] High       : --video-bit-rate 16M  --max-size 1440")
-    print("  [4] Very High  : --video-bit-rate 24M  --max-size 1440")
-    print("  [5] Ultra      : --video-bit-rate 32M  --max-size 2160")
-    print("  [6] Extreme    : --video-bit-rate 64M  --max-size 2160")
-    print("  [7] Insane     : --video-bit-rate 72M  --max-size 2160")
-
-    preset = ask("Enter 1-7: ")
-    base = []
-    match preset:
-        case "1":
-            base = ["--video-bit-rate", "2M", "--max-size", "800"]
-        case "2":
-            base = ["--video-bit-rate", "8M", "--max-size", "1080"]
-        case "3":
-            base = ["--video-bit-rate", "16M", "--max-size", "1440"]
-        case "4":
-            base = ["--video-bit-rate", "24M", "--max-size", "1440"]
-        case "5":
-            base = ["--video-bit-rate", "32M", "--max-size", "2160"]
-        case "6":
-            base = ["--video-bit-rate", "64M", "--max-size", "2160"]
-        case "7":
-            base = ["--video-bit-rate", "72M", "--max-size", "2160"]
-        case _:
-            print("Invalid choice. Using Default.")
-            base = ["--video-bit-rate", "8M", "--max-size", "1080"]
+    for i, (name, rate, size) in enumerate(SCRCPY_PRESETS, start=1):
+        print(f"  [{i}] {name:<11}: --video-bit-rate {rate:<4} --max-size {size}")
+
+    preset = ask(f"Enter 1-{len(SCRCPY_PRESETS)}: ")
+    if preset.isdigit() and 1 <= int(preset) <= len(SCRCPY_PRESETS):
+        base = preset_opts(int(preset))
+    else:
+        print("Invalid choice. Using Default.")
+        base = preset_opts(DEFAULT_PRESET)
 
     if stay_awake_ok:
         base += ["--stay-awake"]
@@ -598,15 +1089,245 @@ def pick_scrcpy_opts(stay_awake_ok: bool) -> list[str]:
         rec = ask("  File name [default record.mp4]: ", "record.mp4")
         base += ["--record", rec]
 
+    if ask(f"Capture FPS telemetry? (--print-fps, log to {FILE_TELEMETRY}) [y/N]: ", "N").lower().startswith("y"):
+        base += ["--print-fps"]
+
     return base
 
 
+def preset_name(opts: list[str]) -> str:
+    """Name of the preset whose bitrate/size appear in opts ("custom" if none)."""
+    for num, (name, _rate, _size) in enumerate(SCRCPY_PRESETS, start=1):
+        if preset_opts(num) == opts[:4]:
+            return name
+    return "custom"
+
+
+class ScrcpyTelemetry:
+    """Parses scrcpy --print-fps output into per-session samples and events."""
+
+    FPS_RE = re.compile(r"\b(\d+)\s+fps(?:\s+\(\+(\d+)\s+frames?\s+skipped\))?", re.I)
+    DISCONNECT_RE = re.compile(r"device disconnected|connection (?:lost|reset)|broken pipe|demuxer error|controller error", re.I)
+    RECONNECT_RE = re.compile(r"reconnect", re.I)
+
+    def __init__(self, endpoint: str, preset: str, log_path: Path | None = None):
+        self.endpoint = endpoint
+        self.preset = preset
+        self.log_path = log_path
+        self.started = time.time()
+        self.samples = 0
+        self.fps_sum = 0
+        self.fps_min: int | None = None
+        self.fps_max = 0
+        self.skipped = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self._log = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    def record(self, kind: str, **fields):
+        if self._log:
+            row = {"ts": round(time.time(), 3), "type": kind, "endpoint": self.endpoint, "preset": self.preset, **fields}
+            self._log.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._log.flush()
+
+    def feed(self, line: str) -> dict | None:
+        """Consume one output line; return the parsed event (or None)."""
+        m = self.FPS_RE.search(line)
+        if m:
+            fps, skipped = int(m.group(1)), int(m.group(2) or 0)
+            self.samples += 1
+            self.fps_sum += fps
+            self.fps_min = fps if self.fps_min is None else min(self.fps_min, fps)
+            self.fps_max = max(self.fps_max, fps)
+            self.skipped += skipped
+            self.record("fps", fps=fps, skipped=skipped)
+            return {"type": "fps", "fps": fps, "skipped": skipped}
+        if self.DISCONNECT_RE.search(line):
+            self.disconnects += 1
+            self.record("disconnect", line=line.strip())
+            return {"type": "disconnect"}
+        if self.RECONNECT_RE.search(line):
+            self.reconnects += 1
+            self.record("reconnect", line=line.strip())
+            return {"type": "reconnect"}
+        return None
+
+    def summary(self, exit_code: int | None = None) -> dict:
+        return {
+            "duration_s": round(time.time() - self.started, 1),
+            "samples": self.samples,
+            "fps_avg": round(self.fps_sum / self.samples, 1) if self.samples else None,
+            "fps_min": self.fps_min,
+            "fps_max": self.fps_max if self.samples else None,
+            "frames_skipped": self.skipped,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "exit_code": exit_code,
+        }
+
+    def close(self, exit_code: int | None = None) -> dict:
+        summ = self.summary(exit_code)
+        self.record("session", **summ)
+        if self._log:
+            self._log.close()
+            self._log = None
+        return summ
+
+
+def print_telemetry_summary(t: ScrcpyTelemetry, summ: dict):
+    print()
+    print(Colors.c("===== SCRCPY SESSION =====", Colors.H1))
+    print("ENDPOINT   :", t.endpoint)
+    print("PRESET     :", t.preset)
+    print("DURATION   :", f"{summ['duration_s']}s")
+    if summ["samples"]:
+        print("FPS        :", f"avg {summ['fps_avg']}  min {summ['fps_min']}  max {summ['fps_max']}  ({summ['samples']} samples)")
+    else:
+        print("FPS        : no samples (scrcpy printed no FPS lines)")
+    print("SKIPPED    :", summ["frames_skipped"], "frames")
+    print("DISCONNECTS:", summ["disconnects"], " RECONNECTS:", summ["reconnects"])
+    if t.log_path:
+        print(Colors.c(f'Samples appended to "{t.log_path}"', Colors.DIM))
+
+
+class BitrateController:
+    """Decides preset steps from FPS samples (one per second from scrcpy --print-fps).
+
+    Steps down after `down_window` consecutive samples below target; steps back up
+    after `up_window` consecutive samples at/above target. Each failure at a preset
+    doubles the hold needed before retrying it (hysteresis against oscillation).
+    Samples of 0 fps are treated as an idle screen (scrcpy sends no frames when
+    nothing changes) and neither count for nor against the link.
+    """
+
+    def __init__(self, preset: int, target_fps: int, max_preset: int | None = None,
+                 down_window: int = 5, up_window: int = 30, warmup: int = 2):
+        self.preset = preset
+        self.target_fps = target_fps
+        self.max_preset = max_preset or preset
+        self.down_window = down_window
+        self.up_window = up_window
+        self.warmup = warmup
+        self.failures: dict[int, int] = {}  # preset -> times we had to leave it
+        self._reset()
+
+    def _reset(self):
+        self._skip = self.warmup
+        self._low = 0
+        self._good = 0
+
+    def up_hold(self) -> int:
+        """Good samples required before stepping up to preset + 1."""
+        return self.up_window * (2 ** self.failures.get(self.preset + 1, 0))
+
+    def feed(self, fps: int) -> str | None:
+        """Feed one sample; return "down"/"up" when the preset changed, else None."""
+        if self._skip > 0:
+            self._skip -= 1
+            return None
+        if fps <= 0:
+            return None
+        if fps < self.target_fps:
+            self._low += 1
+            self._good = 0
+        else:
+            self._good += 1
+            self._low = 0
+        if self._low >= self.down_window and self.preset > 1:
+            self.failures[self.preset] = self.failures.get(self.preset, 0) + 1
+            self.preset -= 1
+            self._reset()
+            return "down"
+        if self._good >= self.up_hold() and self.preset < self.max_preset:
+            self.preset += 1
+            self._reset()
+            return "up"
+        return None
+
+
+def scrcpy_cmd(target: str, opts: list[str]) -> list[str]:
+    """scrcpy argv; devices behind a remote adb server tunnel through that host."""
+    addr = server_addr(server_of(target))
+    tunnel = [f"--tunnel-host={addr[0]}"] if addr and addr[0] not in ("localhost", "127.0.0.1") else []
+    return ["scrcpy", "-s", target, *tunnel, *opts]
+
+
+def _scrcpy_session(target: str, opts: list[str], controller: BitrateController | None = None) -> tuple[int | None, str | None]:
+    """Run one telemetry session; returns (exit code, controller action that ended it)."""
+    tele = ScrcpyTelemetry(target, preset_name(opts), Path(FILE_TELEMETRY))
+    code = None
+    action = None
+    proc = subprocess.Popen(scrcpy_cmd(target, opts), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=adb_env(target))
+    try:
+        for raw in proc.stdout:
+            line = raw.decode(errors="ignore").rstrip("\r\n")
+            print(line, flush=True)  # still show scrcpy's own output
+            ev = tele.feed(line)
+            if controller and ev and ev["type"] == "fps":
+                action = controller.feed(ev["fps"])
+                if action:
+                    tele.record("switch", action=action, to_preset=SCRCPY_PRESETS[controller.preset - 1][0])
+                    proc.terminate()
+                    break
+        try:
+            code = proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            code = proc.wait()
+    except KeyboardInterrupt:
+        # scrcpy got the same Ctrl+C; let it finish writing before summarizing
+        try:
+            code = proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    summ = tele.close(code)
+    print_telemetry_summary(tele, summ)
+    return code, action
+
+
+def launch_scrcpy(target: str, opts: list[str], target_fps: int | None = None) -> int | None:
+    """Run scrcpy on target; with --print-fps in opts, parse its output and log telemetry.
+
+    With target_fps, supervise the session: restart one preset lower when FPS stays
+    below target, and step back up after a period of stable delivery.
+    """
+    if "--print-fps" not in opts:
+        # Launch and inherit stdio
+        try:
+            return subprocess.run(scrcpy_cmd(target, opts), env=adb_env(target)).returncode
+        except KeyboardInterrupt:
+            return None
+    if not target_fps:
+        return _scrcpy_session(target, opts)[0]
+
+    num = next((i for i in range(1, len(SCRCPY_PRESETS) + 1) if preset_opts(i) == opts[:4]), None)
+    if num is None:
+        num, opts = DEFAULT_PRESET, preset_opts(DEFAULT_PRESET) + opts
+    extras = opts[4:]
+    ctl = BitrateController(num, target_fps)
+    while True:
+        code, action = _scrcpy_session(target, preset_opts(ctl.preset) + extras, ctl)
+        if not action:
+            return code  # scrcpy exited on its own (window closed, Ctrl+C, error)
+        name = SCRCPY_PRESETS[ctl.preset - 1][0]
+        arrow = "v" if action == "down" else "^"
+        print(Colors.c(f"[ADAPT {arrow}]", Colors.WARN), f"restarting scrcpy with preset {ctl.preset} ({name}), target {target_fps} fps")
+
+
+def ask_adaptive(opts: list[str]) -> int | None:
+    """Ask for an adaptive-bitrate target FPS (only offered when telemetry is on)."""
+    if "--print-fps" not in opts:
+        return None
+    fps = ask_int("Adaptive bitrate: target FPS to hold (Enter = off): ", None)
+    return fps if fps and fps > 0 else None
+
+
 def save_connect_json(target_serial: str, last_info: dict):
     # Build entry
     ip_save = last_info.get("ip")
     if not ip_save and ":" in target_serial:
         ip_save = target_serial.split(":", 1)[0]
-    serial_real = parse_first(run(["adb", "-s", target_serial, "get-serialno"])[1]) or target_serial
+    serial_real = parse_first(adb_shell(target_serial, "getprop", "ro.serialno")) or target_serial
 
     # NEW: preserve the actual target endpoint if it includes a custom port
     if ":" in target_serial:
@@ -627,7 +1348,9 @@ def save_connect_json(target_serial: str, last_info: dict):
         "battery": last_info.get("battery"),
         "ssid": last_info.get("ssid"),
         "ip": ip_save,
+        "mac": last_info.get("mac"),
         "endpoint": ep_save,
+        "server": server_of(target_serial) or None,
     }
     added = append_if_device_model_missing(Path(FILE_CONN), entry)
     if not added:
@@ -670,43 +1393,49 @@ def cmd_connect():
             port_in = ask_int(f"ADB Wi‑Fi port [default {DEFAULT_ADB_PORT}]: ", DEFAULT_ADB_PORT)
             target = normalize_dest(dest, port_in)
 
+    target = resolve_endpoint(target)
     print()
-    print(Colors.c("[ADB]", Colors.LBL), f"connecting to {target} ...")
-    run(["adb", "disconnect", target])
-    run(["adb", "connect", target])
+    warm = prewarmed(target)
+    if warm:
+        print(Colors.c("[WARM]", Colors.NOTE), f"{target} already connected by the pre-warmer")
+    elif prewarming(target):
+        # Don't disconnect under the warmer's probes; `adb connect` is a no-op if already connected
+        print(Colors.c("[ADB]", Colors.LBL), f"connecting to {target} (still warming up in the background) ...")
+        run([*adb_base(server=server_of(target)), "connect", target])
+    else:
+        print(Colors.c("[ADB]", Colors.LBL), f"connecting to {target} ...")
+        close_shell(target)
+        run([*adb_base(server=server_of(target)), "disconnect", target])
+        run([*adb_base(server=server_of(target)), "connect", target])
 
-    state = adb_get_state(target)
+    state = "device" if warm else adb_get_state(target)
     if state.lower() != "device":
         print()
         print(Colors.c("[ERROR]", Colors.ERR), f"Failed to connect as \"device\". Current state: \"{state}\"")
         print("Check Wi‑Fi IP, SSID, and ensure ADB over Wi‑Fi is enabled on the phone.")
         return
 
-    info = print_device_info(target)
+    info = print_device_info(target, warm["info"] if warm else None)
     # Also show the actual endpoint in case of custom port
     print(Colors.c("ADB_TCP (connected):", Colors.DIM), target)
 
     save_connect_json(target, info)
-    stay_ok = check_stay_awake_support(target)
+    stay_ok = warm["stay_ok"] if warm else check_stay_awake_support(target)
 
     opts = pick_scrcpy_opts(stay_ok)
+    fps_target = ask_adaptive(opts)
     print()
     print("Launching scrcpy with:\n  ", " ".join(map(str, opts)))
 
     if which("scrcpy"):
-        # Launch and inherit stdio
-        cmd = ["scrcpy", "-s", target, *opts]
-        try:
-            subprocess.run(cmd)
-        except KeyboardInterrupt:
-            pass
+        launch_scrcpy(target, opts, fps_target)
     else:
         print()
         print(Colors.c("[INFO]", Colors.INFO), "scrcpy is not installed, skipping mirroring launch.")
 
 
 def build_combined_list() -> list[dict]:
-    """Return list of {serial, model, ip, endpoint, source} deduped by IP."""
+    """Return list of {serial, model, ip, endpoint, ssid, mac, timestamp, server, source} deduped by IP."""
     out: list[dict] = []
     seen_ips: set[str] = set()
 
@@ -725,11 +1454,39 @@ def build_combined_list() -> list[dict]:
                 "model": model,
                 "ip": ip,
                 "endpoint": endpoint,
+                "ssid": it.get("ssid") or "",
+                "mac": (it.get("mac") or "").lower(),
+                "timestamp": it.get("timestamp") or "",
+                "server": it.get("server") or "",
                 "source": src,
             })
+            if it.get("server"):
+                _device_server.setdefault(endpoint, it["server"])
     return out
 
 
+def merged_server_view() -> list[dict]:
+    """Inventory rows plus devices live on any configured adb server, each with state + server."""
+    live = adb_devices_by_server()
+    states = {(server, serial): state for server, serial, state in live}  # state as seen by the owner
+    rows = build_combined_list()
+    known = {r["endpoint"] for r in rows} | {r["serial"] for r in rows}
+    for r in rows:
+        r["server"] = server_of(r["endpoint"])
+        r["state"] = states.get((r["server"], r["endpoint"]), "offline")
+    for _server, serial, _state in live:
+        if serial in known:
+            continue
+        known.add(serial)
+        server = server_of(serial)
+        rows.append({
+            "serial": serial, "model": "", "ip": serial.split(":", 1)[0] if ":" in serial else "",
+            "endpoint": serial, "ssid": "", "mac": "", "timestamp": "", "server": server,
+            "source": "adb (live)", "state": states[(server, serial)],
+        })
+    return rows
+
+
 def cmd_list():
     print(Colors.c("=== Reading device list from JSON (read‑only) ===", Colors.H1))
     p1, p2 = Path(FILE_SETUP), Path(FILE_CONN)
@@ -737,7 +1494,7 @@ def cmd_list():
     sz2 = p2.stat().st_size if p2.exists() else "?"
     print(Colors.c("File info:", Colors.DIM), f"{FILE_SETUP} (size={sz1}) | {FILE_CONN} (size={sz2})")
 
-    rows = build_combined_list()
+    rows = merged_server_view() if ADB_SERVERS else build_combined_list()
     if not rows:
         print()
         print(Colors.c("[INFO]", Colors.WARN), "Could not build the merged list (no data).")
@@ -754,14 +1511,22 @@ def cmd_list():
 
     print()
     print(Colors.c("===== SUMMARY =====", Colors.H1))
-    print(" No  Serial               Model                  IP              Endpoint          Status")
-    print(" --  -------------------- ---------------------- --------------- ----------------- -------")
+    if ADB_SERVERS:
+        print(" No  Server                 Serial               Model                  IP              Endpoint          Status")
+        print(" --  ---------------------- -------------------- ---------------------- --------------- ----------------- -------")
+    else:
+        print(" No  Serial               Model                  IP              Endpoint          Status")
+        print(" --  -------------------- ---------------------- --------------- ----------------- -------")
 
     for i, rec in enumerate(rows, start=1):
         serpad = rec["serial"][:20].ljust(20)
         modpad = (rec["model"] or "")[:22].ljust(22)
         ippad = rec["ip"][:15].ljust(15)
         eppad = rec["endpoint"][:17].ljust(17)
+        if ADB_SERVERS:
+            srvpad = server_label(rec["server"])[:22].ljust(22)
+            print(f" {i:<2}  {srvpad} {serpad} {modpad} {ippad} {eppad} {rec['state']}")
+            continue
         state = adb_get_state(rec["endpoint"]) or "offline"
         print(f" {i:<2}  {serpad} {modpad} {ippad} {eppad} {state}")
 
@@ -779,12 +1544,24 @@ def cmd_list():
 
 
 def connect_from_list(target: str):
+    target = resolve_endpoint(target)
     print()
-    print(Colors.c("[ADB]", Colors.LBL), f"connect to {target} ...")
-    run(["adb", "disconnect", target])
-    run(["adb", "connect", target])
+    warm = prewarmed(target)
+    if warm:
+        print(Colors.c("[WARM]", Colors.NOTE), f"{target} already connected by the pre-warmer")
+    elif ":" not in target:
+        print(Colors.c("[ADB]", Colors.LBL), f"{target} is a USB device on {server_label(server_of(target))}")
+    elif prewarming(target):
+        # Don't disconnect under the warmer's probes; `adb connect` is a no-op if already connected
+        print(Colors.c("[ADB]", Colors.LBL), f"connect to {target} (still warming up in the background) ...")
+        run([*adb_base(server=server_of(target)), "connect", target])
+    else:
+        print(Colors.c("[ADB]", Colors.LBL), f"connect to {target} ...")
+        close_shell(target)
+        run([*adb_base(server=server_of(target)), "disconnect", target])
+        run([*adb_base(server=server_of(target)), "connect", target])
 
-    state = adb_get_state(target)
+    state = "device" if warm else adb_get_state(target)
     if state.lower() != "device":
         print()
         print(Colors.c("[ERROR]", Colors.ERR), f"Failed to connect as \"device\". Current state: \"{state}\"")
@@ -792,20 +1569,18 @@ def connect_from_list(target: str):
         press_enter("\nPress Enter to return...")
         return
 
-    info = print_device_info(target)
+    info = print_device_info(target, warm["info"] if warm else None)
     print(Colors.c("ADB_TCP (connected):", Colors.DIM), target)
     save_connect_json(target, info)
-    stay_ok = check_stay_awake_support(target)
+    stay_ok = warm["stay_ok"] if warm else check_stay_awake_support(target)
 
     opts = pick_scrcpy_opts(stay_ok)
+    fps_target = ask_adaptive(opts)
     print()
     print("Launching scrcpy with:\n  ", " ".join(map(str, opts)))
 
     if which("scrcpy"):
-        try:
-            subprocess.run(["scrcpy", "-s", target, *opts])
-        except KeyboardInterrupt:
-            pass
+        launch_scrcpy(target, opts, fps_target)
     else:
         print()
         print(Colors.c("[INFO]", Colors.INFO), "scrcpy is not installed, skipping mirroring launch.")
@@ -818,7 +1593,8 @@ def cmd_usb_back():
     for serial, _state in adb_devices():
         if ":" in serial:
             print("  -", serial, "> usb")
-            run(["adb", "-s", serial, "usb"])  # ignore errors
+            close_shell(serial)
+            run([*adb_base(serial), "usb"])  # ignore errors
     print("Done.")
 
 
@@ -826,7 +1602,9 @@ def cmd_usb_back():
 
 def cmd_disconnect_all():
     print("\nDisconnecting all ADB TCP endpoints...")
-    run(["adb", "disconnect"])  # no args: disconnect everything
+    close_shell()
+    for server in ADB_SERVERS or [""]:
+        run([*adb_base(server=server), "disconnect"])  # no args: disconnect everything
     print("Done.")
 
 
@@ -843,16 +1621,1305 @@ def cmd_pair():
     print(f"\nadb pair {pair_ep}")
     if pair_code:
         # Feed code via stdin
-        run(["adb", "pair", pair_ep], input_text=pair_code + "\n")
+        run([*adb_base(server=server_of(None)), "pair", pair_ep], input_text=pair_code + "\n")
     else:
-        subprocess.run(["adb", "pair", pair_ep])
+        subprocess.run([*adb_base(server=server_of(None)), "pair", pair_ep])
 
     print("\nIf pairing succeeds, connect the device endpoint (usually IP:5555).")
     c_ep = ask("Endpoint to connect [default derived from IP:5555]: ")
     if not c_ep:
         host = pair_ep.split(":", 1)[0]
         c_ep = f"{host}:{DEFAULT_ADB_PORT}"
-    run(["adb", "connect", c_ep])
+    run([*adb_base(server=server_of(None)), "connect", c_ep])
+
+
+# ----------------------------------------------------------------------------
+# Fleet (multi-device) helpers
+# ----------------------------------------------------------------------------
+
+def parse_selection(spec: str, rows: list[dict]) -> list[dict]:
+    """Select rows by spec: "" / "all", Ids ("1,3,5-7") or text matched against serial/model/ip/endpoint."""
+    spec = (spec or "").strip()
+    if not spec or spec.lower() == "all":
+        return list(rows)
+    picked: list[dict] = []
+    for tok in (t.strip() for t in spec.split(",")):
+        if not tok:
+            continue
+        m = re.fullmatch(r"(\d+)(?:-(\d+))?", tok)
+        if m:
+            lo = int(m.group(1))
+            hi = int(m.group(2) or lo)
+            cands = [rows[i - 1] for i in range(lo, hi + 1) if 1 <= i <= len(rows)]
+        else:
+            low = tok.lower()
+            cands = [r for r in rows if any(low in (r.get(k) or "").lower() for k in ("serial", "model", "ip", "endpoint"))]
+        for r in cands:
+            if r not in picked:
+                picked.append(r)
+    return picked
+
+
+def select_targets(spec: str | None = None) -> list[dict]:
+    """Resolve inventory devices for a fleet command; prompt for a selection if spec is None."""
+    # With several adb servers, live devices on any of them are selectable too
+    rows = merged_server_view() if ADB_SERVERS else build_combined_list()
+    if not rows:
+        print(Colors.c("[INFO]", Colors.WARN), f"No devices in {FILE_SETUP} / {FILE_CONN}. Run Setup or Connect first.")
+        return []
+    if spec is None:
+        print()
+        print(" Id  IP               Endpoint           Model")
+        print(" --  ---------------  -----------------  --------------------")
+        for i, rec in enumerate(rows, start=1):
+            print(f" {i:<2}  {rec['ip']:<15}  {rec['endpoint']:<17}  {(rec['model'] or '')[:20]}")
+        spec = ask("Pick Ids (e.g. 1,3,5-7 or text; Enter=all): ", "")
+    return parse_selection(spec, rows)
+
+
+def ensure_connected(endpoint: str) -> bool:
+    """Return True if endpoint is in "device" state, running `adb connect` once if needed."""
+    if adb_get_state(endpoint) == "device":
+        return True
+    if ":" in endpoint:
+        run([*adb_base(server=server_of(endpoint)), "connect", endpoint])
+    return adb_get_state(endpoint) == "device"
+
+
+def device_labels(targets: list[dict]) -> dict[str, str]:
+    """Map endpoint -> fixed-width "[endpoint model]" prefix for streamed output."""
+    raw = {t["endpoint"]: f"[{t['endpoint']} {(t.get('model') or '?')[:16]}]" for t in targets}
+    width = max((len(v) for v in raw.values()), default=0)
+    return {k: v.ljust(width) for k, v in raw.items()}
+
+
+def safe_filename(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", text).strip("_") or "device"
+
+
+def _exec_one(rec: dict, command: list[str], label: str, out_dir: Path | None) -> dict:
+    """Run one shell command on one device, streaming output line by line."""
+    ep = rec["endpoint"]
+    res = {"endpoint": ep, "model": rec.get("model") or "", "code": None, "lines": 0, "secs": 0.0}
+    t0 = time.monotonic()
+    if not ensure_connected(ep):
+        res["status"] = "offline"
+        tprint(Colors.c(label, Colors.DIM), Colors.c("not reachable (offline)", Colors.ERR))
+        return res
+
+    fh = open(out_dir / f"{safe_filename(ep)}.log", "w", encoding="utf-8") if out_dir else None
+    try:
+        proc = subprocess.Popen(
+            [*adb_base(ep), "shell", *command],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        # Iterate the pipe: only one line is ever held in memory per device
+        for raw in proc.stdout:
+            line = raw.decode(errors="ignore").rstrip("\r\n")
+            tprint(Colors.c(label, Colors.DIM), line)
+            if fh:
+                fh.write(line + "\n")
+            res["lines"] += 1
+        res["code"] = proc.wait()
+    except FileNotFoundError:
+        res["code"] = 127
+    finally:
+        if fh:
+            fh.close()
+    res["secs"] = time.monotonic() - t0
+    res["status"] = "ok" if res["code"] == 0 else "fail"
+    return res
+
+
+def cmd_exec(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py exec", description="Run an adb shell command on many devices in parallel.")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help=f"max concurrent devices (default {DEFAULT_JOBS})")
+    parser.add_argument("-o", "--out", help="directory for per-device output files")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="shell command (use -- before it)")
+    args = parser.parse_args(argv or [])
+
+    print(Colors.c("=== Run a shell command across devices ===", Colors.H1))
+    command = args.command
+    if command and command[0] == "--":
+        command = command[1:]
+    if not command:
+        line = ask("Shell command (e.g. getprop ro.product.model): ", "")
+        if not line.strip():
+            print("Command is required.")
+            return
+        command = [line]
+
+    # Non-interactive invocations default to every inventory device
+    targets = select_targets(args.devices if args.devices or not argv else "all")
+    if not targets:
+        print("No devices selected.")
+        return
+
+    out_dir = None
+    if args.out:
+        out_dir = Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = max(1, args.jobs)
+    labels = device_labels(targets)
+    print(Colors.c("[EXEC]", Colors.INFO), f"{' '.join(command)}  ->  {len(targets)} device(s), jobs={jobs}\n")
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda t: _exec_one(t, command, labels[t["endpoint"]], out_dir), targets))
+
+    print()
+    print(Colors.c("===== SUMMARY =====", Colors.H1))
+    print(" No  Endpoint           Model                  Exit  Lines   Time    Status")
+    print(" --  -----------------  ---------------------- ----  ------  ------  -------")
+    for i, r in enumerate(results, start=1):
+        code = "-" if r["code"] is None else str(r["code"])
+        status = Colors.c(r["status"], Colors.NOTE if r["status"] == "ok" else Colors.ERR)
+        print(f" {i:<2}  {r['endpoint'][:17]:<17}  {r['model'][:22]:<22} {code:>4}  {r['lines']:>6}  {r['secs']:>5.1f}s  {status}")
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print()
+    print(f"{len(results) - failed} ok, {failed} failed")
+    if out_dir:
+        print(f'Per-device output saved in "{out_dir}"')
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def remote_file_matches(serial: str, remote: str, size: int, digest: str) -> bool:
+    """True if the file on the device has the same size and SHA-256 as the local one."""
+    out = parse_first(adb_shell(serial, "stat", "-c", "%s", remote))
+    if not out.isdigit() or int(out) != size:
+        return False
+    # Hashing a multi-GB file can outlast SHELL_TIMEOUT; use a one-off shell with no deadline
+    _, out, _ = run([*adb_base(serial), "shell", "sha256sum", shlex.quote(remote)])
+    out = parse_first(out)
+    return out.split(" ", 1)[0].lower() == digest
+
+
+def installed_apk_path(serial: str, package: str) -> str:
+    """Path of the installed base APK for package ("" if not installed)."""
+    for line in adb_shell(serial, "pm", "path", package).splitlines():
+        line = line.strip()
+        if line.startswith("package:") and line.endswith("base.apk"):
+            return line[len("package:"):]
+    return ""
+
+
+def interleave_by_ssid(targets: list[dict]) -> list[dict]:
+    """Round-robin targets across SSIDs so workers don't all queue on one AP."""
+    groups: dict[str, list[dict]] = {}
+    for t in targets:
+        groups.setdefault(t.get("ssid") or "", []).append(t)
+    out: list[dict] = []
+    queues = list(groups.values())
+    while queues:
+        for q in queues:
+            out.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return out
+
+
+class TransferJob:
+    """Shared state for one fan-out transfer: per-SSID semaphores and progress counter."""
+
+    def __init__(self, local: Path, remote: str, mode: str, package: str | None,
+                 ssid_jobs: int, retries: int, total: int):
+        self.local = local
+        self.remote = remote
+        self.mode = mode  # "push" or "install"
+        self.package = package
+        self.size = local.stat().st_size
+        self.digest = sha256_file(local)
+        self.retries = retries
+        self.ssid_jobs = ssid_jobs
+        self.total = total
+        self.done = 0
+        self.active: dict[str, float] = {}  # label -> monotonic start of the running transfer
+        self._lock = threading.Lock()
+        self._ssid_sems: dict[str, threading.Semaphore] = {}
+
+    def ssid_sem(self, ssid: str) -> threading.Semaphore:
+        with self._lock:
+            if ssid not in self._ssid_sems:
+                self._ssid_sems[ssid] = threading.Semaphore(self.ssid_jobs)
+            return self._ssid_sems[ssid]
+
+    def tick(self) -> int:
+        with self._lock:
+            self.done += 1
+            return self.done
+
+    def report_progress(self, stop: threading.Event):
+        """Every PROGRESS_EVERY seconds, print the transfers still running and their elapsed time."""
+        while not stop.wait(PROGRESS_EVERY):
+            now = time.monotonic()
+            with self._lock:
+                running = sorted(self.active.items(), key=lambda kv: kv[1])
+                done = self.done
+            if running:
+                shown = ", ".join(f"{label.strip()} {now - t0:.0f}s" for label, t0 in running[:6])
+                more = f" (+{len(running) - 6} more)" if len(running) > 6 else ""
+                tprint(Colors.c(f"[{done}/{self.total} done]", Colors.DIM), f"in flight: {shown}{more}")
+
+    def already_present(self, ep: str) -> bool:
+        if self.mode == "push":
+            return remote_file_matches(ep, self.remote, self.size, self.digest)
+        if self.package:
+            path = installed_apk_path(ep, self.package)
+            return bool(path) and remote_file_matches(ep, path, self.size, self.digest)
+        return False
+
+    def transfer(self, ep: str, label: str) -> tuple[int, str]:
+        with self._lock:
+            self.active[label] = time.monotonic()
+        try:
+            return self._transfer(ep)
+        finally:
+            with self._lock:
+                self.active.pop(label, None)
+
+    def _transfer(self, ep: str) -> tuple[int, str]:
+        if self.mode == "push":
+            code, out, err = run([*adb_base(ep), "push", str(self.local), self.remote])
+        else:
+            code, out, err = run([*adb_base(ep), "install", "-r", str(self.local)])
+            # Older adb versions return 0 even when the install failed
+            if code == 0 and "Failure" in out:
+                code = 1
+        return code, parse_first((err or "") + "\n" + (out or "")) if code else ""
+
+
+def _transfer_one(rec: dict, job: TransferJob, label: str) -> dict:
+    ep = rec["endpoint"]
+    ssid = rec.get("ssid") or ""
+    res = {"endpoint": ep, "model": rec.get("model") or "", "ssid": ssid, "tries": 0, "secs": 0.0, "rate": 0.0, "note": ""}
+    for attempt in range(1, job.retries + 2):
+        res["tries"] = attempt
+        # The SSID slot is held per attempt, so a backing-off device doesn't block its AP
+        with job.ssid_sem(ssid):
+            if not ensure_connected(ep):
+                res["status"], res["note"] = "offline", "not reachable"
+            elif job.already_present(ep):
+                res["status"], res["note"] = "skip", "size+sha256 match"
+                break
+            else:
+                t0 = time.monotonic()
+                code, msg = job.transfer(ep, label)
+                res["secs"] = time.monotonic() - t0
+                if code == 0:
+                    res["status"] = "ok"
+                    res["rate"] = job.size / max(res["secs"], 1e-6) / (1 << 20)
+                    break
+                res["status"], res["note"] = "fail", msg
+        if attempt <= job.retries:
+            tprint(Colors.c(label, Colors.DIM), Colors.c(f"{res['note'] or 'failed'}; retry {attempt}/{job.retries}", Colors.WARN))
+            time.sleep(min(2 ** attempt, 10))
+    n = job.tick()
+    if res["status"] == "ok":
+        detail = f"{job.size / (1 << 20):.1f} MB in {res['secs']:.1f}s ({res['rate']:.1f} MB/s)"
+    else:
+        detail = res["note"]
+    color = {"ok": Colors.NOTE, "skip": Colors.INFO}.get(res["status"], Colors.ERR)
+    tprint(f"[{n}/{job.total}]", Colors.c(label, Colors.DIM), Colors.c(res["status"], color), detail)
+    return res
+
+
+def _fanout_transfer(mode: str, argv: list[str] | None):
+    parser = argparse.ArgumentParser(prog=f"wifi_adb.py {mode}", description=f"{mode.capitalize()} a file to many devices in parallel.")
+    parser.add_argument("file", nargs="?", help="local file" if mode == "push" else "local APK")
+    if mode == "push":
+        parser.add_argument("remote", nargs="?", help="device path (default /sdcard/Download/<name>)")
+    else:
+        parser.add_argument("-p", "--package", help="package name; skip devices where the installed APK already matches")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help=f"global max concurrent transfers (default {DEFAULT_JOBS})")
+    parser.add_argument("--ssid-jobs", type=int, default=DEFAULT_SSID_JOBS, help=f"max concurrent transfers per SSID (default {DEFAULT_SSID_JOBS})")
+    parser.add_argument("-r", "--retries", type=int, default=DEFAULT_RETRIES, help=f"retries per device (default {DEFAULT_RETRIES})")
+    args = parser.parse_args(argv or [])
+
+    local = Path(args.file or ask("Local file path: " if mode == "push" else "APK path: ", "").strip().strip('"'))
+    if not local.is_file():
+        print(Colors.c("[ERROR]", Colors.ERR), f"File not found: {local}")
+        return
+    remote = ""
+    if mode == "push":
+        remote = args.remote or (ask(f"Device path [default /sdcard/Download/{local.name}]: ", "") if not argv else "")
+        remote = remote or f"/sdcard/Download/{local.name}"
+        if remote.endswith("/"):
+            remote += local.name
+
+    targets = select_targets(args.devices if args.devices or not argv else "all")
+    if not targets:
+        print("No devices selected.")
+        return
+
+    job = TransferJob(local, remote, mode, getattr(args, "package", None),
+                      max(1, args.ssid_jobs), max(0, args.retries), len(targets))
+    jobs = max(1, args.jobs)
+    labels = device_labels(targets)
+    dest = f" -> {remote}" if remote else ""
+    print(Colors.c(f"[{mode.upper()}]", Colors.INFO), f"{local.name} ({job.size / (1 << 20):.1f} MB){dest}  ->  {len(targets)} device(s), jobs={jobs}, per-SSID={job.ssid_jobs}\n")
+    t0 = time.monotonic()
+    stop = threading.Event()
+    threading.Thread(target=job.report_progress, args=(stop,), daemon=True).start()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda t: _transfer_one(t, job, labels[t["endpoint"]]), interleave_by_ssid(targets)))
+    finally:
+        stop.set()
+    wall = time.monotonic() - t0
+
+    print()
+    print(Colors.c("===== SUMMARY =====", Colors.H1))
+    print(" No  Endpoint           Model                  SSID             Tries  MB/s    Status")
+    print(" --  -----------------  ---------------------- ---------------- -----  ------  -------")
+    for i, r in enumerate(results, start=1):
+        rate = f"{r['rate']:.1f}" if r["rate"] else "-"
+        color = {"ok": Colors.NOTE, "skip": Colors.INFO}.get(r["status"], Colors.ERR)
+        print(f" {i:<2}  {r['endpoint'][:17]:<17}  {r['model'][:22]:<22} {r['ssid'][:16]:<16} {r['tries']:>5}  {rate:>6}  {Colors.c(r['status'], color)}")
+    counts = {k: sum(1 for r in results if r["status"] == k) for k in ("ok", "skip")}
+    failed = len(results) - counts["ok"] - counts["skip"]
+    sent = counts["ok"] * job.size / (1 << 20)
+    print()
+    print(f"{counts['ok']} ok, {counts['skip']} skipped, {failed} failed — {sent:.1f} MB in {wall:.1f}s ({sent / max(wall, 1e-6):.1f} MB/s aggregate)")
+
+
+def cmd_push(argv: list[str] | None = None):
+    print(Colors.c("=== Push a file to many devices ===", Colors.H1))
+    _fanout_transfer("push", argv)
+
+
+def cmd_install(argv: list[str] | None = None):
+    print(Colors.c("=== Install an APK on many devices ===", Colors.H1))
+    _fanout_transfer("install", argv)
+
+
+def tcp_rtt_ms(endpoint: str, timeout: float = 1.0) -> float | None:
+    """TCP handshake time to host:port in ms (None if unreachable)."""
+    host, _, port = endpoint.rpartition(":")
+    if not host or not port.isdigit():
+        return None
+    t0 = time.perf_counter()
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            pass
+    except OSError:
+        return None
+    return (time.perf_counter() - t0) * 1000
+
+
+class Dashboard:
+    """Live device table redrawn in place: only cells whose text changed are rewritten."""
+
+    COLS = [("Id", 3), ("Endpoint", 21), ("Model", 18), ("State", 12), ("Batt", 5), ("SSID", 16), ("RTT", 8)]
+    TOP = 4  # first table row (1-based; title, header and rule above it)
+
+    def __init__(self, rows: list[dict], interval: float = 1.0, slow_interval: float = 15.0, jobs: int = DEFAULT_JOBS):
+        self.rows = rows
+        self.interval = interval
+        self.slow_interval = slow_interval
+        self.jobs = jobs
+        self.data = {r["endpoint"]: {"state": "...", "battery": "", "ssid": r.get("ssid") or "", "rtt": None} for r in rows}
+        self._drawn: dict[tuple[int, int], str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._paused = threading.Event()
+        self._x = [1]
+        for _name, w in self.COLS[:-1]:
+            self._x.append(self._x[-1] + w + 1)
+        height = shutil.get_terminal_size((100, 40)).lines
+        self.visible = self.rows[:max(1, height - self.TOP - 3)]
+        self.prompt_row = self.TOP + len(self.visible) + 1
+
+    # -- polling ---------------------------------------------------------------
+    def _poll(self):
+        last_slow = 0.0
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while not self._stop.is_set():
+                t0 = time.monotonic()
+                states = device_states()  # one adb call per server covers every device
+                eps = [r["endpoint"] for r in self.rows]
+                rtts = dict(zip(eps, pool.map(tcp_rtt_ms, eps)))
+                slow = t0 - last_slow >= self.slow_interval
+                live = [ep for ep in eps if states.get(ep) == "device"]
+                extra = dict(zip(live, pool.map(self._slow_props, live))) if slow else {}
+                if slow:
+                    last_slow = t0
+                with self._lock:
+                    for ep in eps:
+                        d = self.data[ep]
+                        d["state"] = states.get(ep, "offline")
+                        d["rtt"] = rtts.get(ep)
+                        if ep in extra:
+                            d.update(extra[ep])
+                self._stop.wait(max(0.0, self.interval - (time.monotonic() - t0)))
+
+    @staticmethod
+    def _slow_props(ep: str) -> dict:
+        return {
+            "battery": parse_battery(adb_shell(ep, "dumpsys", "battery")),
+            "ssid": parse_ssid(adb_shell(ep, "dumpsys", "wifi")),
+        }
+
+    # -- rendering -------------------------------------------------------------
+    def _cells(self) -> dict[tuple[int, int], tuple[str, str]]:
+        cells = {}
+        with self._lock:
+            for i, rec in enumerate(self.visible):
+                d = self.data[rec["endpoint"]]
+                rtt = "-" if d["rtt"] is None else f"{d['rtt']:.0f}ms"
+                batt = f"{d['battery']}%" if d["battery"] else "-"
+                state_color = Colors.NOTE if d["state"] == "device" else Colors.ERR
+                vals = [(str(i + 1), Colors.NUM), (rec["endpoint"], Colors.LBL), (rec.get("model") or "", Colors.LBL),
+                        (d["state"], state_color), (batt, Colors.LBL), (d["ssid"] or "-", Colors.LBL), (rtt, Colors.DIM)]
+                for col, ((text, color), (_n, w)) in enumerate(zip(vals, self.COLS)):
+                    cells[(self.TOP + i, col)] = (text[:w].ljust(w), color)
+        return cells
+
+    def redraw(self):
+        """Write only changed cells; cursor is saved/restored so typing at the prompt is undisturbed."""
+        cells = self._cells()
+        # Diff and write under one lock so a concurrent full_redraw can't wipe cells we just recorded
+        with _print_lock:
+            buf = []
+            for (row, col), (text, color) in cells.items():
+                if self._drawn.get((row, col)) != text:
+                    self._drawn[(row, col)] = text
+                    buf.append(f"\x1b[{row};{self._x[col]}H{Colors.c(text, color)}")
+            if buf:
+                sys.stdout.write("\x1b7" + "".join(buf) + "\x1b8")
+                sys.stdout.flush()
+
+    def full_redraw(self):
+        header = " ".join(name.ljust(w) for name, w in self.COLS)
+        with _print_lock:
+            self._drawn.clear()
+            clear_screen()
+            print(Colors.c("=== Live device dashboard ===", Colors.H1), Colors.c(f"(refresh {self.interval:g}s)", Colors.DIM))
+            print(header)
+            print(" ".join("-" * w for _n, w in self.COLS))
+            if len(self.visible) < len(self.rows):
+                sys.stdout.write(f"\x1b[{self.prompt_row - 1};1H")
+                print(Colors.c(f"(+{len(self.rows) - len(self.visible)} more not shown; enlarge the terminal or narrow with -d)", Colors.DIM))
+        self.redraw()
+
+    def _render_loop(self):
+        while not self._stop.wait(0.25):
+            if not self._paused.is_set():
+                self.redraw()
+
+    # -- interaction -----------------------------------------------------------
+    def run(self):
+        threading.Thread(target=self._poll, daemon=True).start()
+        threading.Thread(target=self._render_loop, daemon=True).start()
+        self.full_redraw()
+        try:
+            while True:
+                with _print_lock:
+                    sys.stdout.write(f"\x1b[{self.prompt_row};1H\x1b[J")
+                    sys.stdout.flush()
+                cmd = ask(Colors.c("c <Id>=connect  m <Id>=mirror  q=quit: ", Colors.ASK), "").strip().lower()
+                if cmd in ("q", "0", "quit", "exit"):
+                    break
+                m = re.fullmatch(r"([cm])\s*(\d+)", cmd)
+                if not m or not (1 <= int(m.group(2)) <= len(self.visible)):
+                    continue
+                ep = self.visible[int(m.group(2)) - 1]["endpoint"]
+                self._paused.set()
+                clear_screen()
+                if m.group(1) == "c":
+                    connect_from_list(ep)
+                else:
+                    mirror_quick(ep)
+                self.full_redraw()
+                self._paused.clear()
+        finally:
+            self._stop.set()
+            with _print_lock:
+                sys.stdout.write(f"\x1b[{self.prompt_row + 1};1H\n")
+
+
+def mirror_quick(target: str):
+    """Launch scrcpy on target with the Default preset (no prompts)."""
+    if not which("scrcpy"):
+        print(Colors.c("[INFO]", Colors.INFO), "scrcpy is not installed, skipping mirroring launch.")
+        press_enter()
+        return
+    if not ensure_connected(target):
+        print(Colors.c("[ERROR]", Colors.ERR), f"{target} is not reachable.")
+        press_enter()
+        return
+    launch_scrcpy(target, preset_opts(DEFAULT_PRESET))
+
+
+def cmd_mirror(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py mirror", description="Launch scrcpy on one device without prompts.",
+                                     epilog="Extra scrcpy options go after --, e.g. mirror 1 -p 3 -- --no-audio")
+    parser.add_argument("target", nargs="?", help="inventory Id/text or IP:PORT (default: first inventory device)")
+    parser.add_argument("-p", "--preset", type=int, default=DEFAULT_PRESET, help=f"starting preset 1-{len(SCRCPY_PRESETS)} (default {DEFAULT_PRESET})")
+    parser.add_argument("-t", "--telemetry", action="store_true", help=f"add --print-fps and log samples to {FILE_TELEMETRY}")
+    parser.add_argument("-a", "--adaptive", type=int, metavar="FPS", help="supervise: step presets down/up to hold this FPS (implies -t)")
+    argv = list(argv or [])
+    extra = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = parser.parse_args(argv[:argv.index("--")] if "--" in argv else argv)
+
+    if not 1 <= args.preset <= len(SCRCPY_PRESETS):
+        print(Colors.c("[ERROR]", Colors.ERR), f"Preset must be 1-{len(SCRCPY_PRESETS)}.")
+        return
+    if not which("scrcpy"):
+        print(Colors.c("[INFO]", Colors.INFO), "scrcpy is not installed, skipping mirroring launch.")
+        return
+
+    target = args.target or ""
+    if not re.fullmatch(r"[\w.\-]+:\d+", target):
+        picked = select_targets(target or "all")
+        if not picked:
+            print("No matching device.")
+            return
+        target = picked[0]["endpoint"]
+    target = resolve_endpoint(target)
+    if not ensure_connected(target):
+        print(Colors.c("[ERROR]", Colors.ERR), f"{target} is not reachable.")
+        return
+
+    opts = preset_opts(args.preset) + extra
+    if (args.telemetry or args.adaptive) and "--print-fps" not in opts:
+        opts += ["--print-fps"]
+    print(Colors.c("[SCRCPY]", Colors.LBL), target, " ".join(opts))
+    launch_scrcpy(target, opts, args.adaptive)
+
+
+def cmd_dashboard(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py dashboard", description="Live device table with in-place redraw.")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("-i", "--interval", type=float, default=1.0, help="state/RTT refresh interval in seconds (default 1)")
+    parser.add_argument("--slow-interval", type=float, default=15.0, help="battery/SSID refresh interval in seconds (default 15)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help=f"max concurrent probes (default {DEFAULT_JOBS})")
+    args = parser.parse_args(argv or [])
+
+    targets = select_targets(args.devices or "all")
+    if not targets:
+        return
+    if not Colors.enabled:
+        print(Colors.c("[INFO]", Colors.WARN), "dashboard needs an ANSI terminal; use `list` instead.")
+        return
+    Dashboard(targets, max(0.2, args.interval), max(1.0, args.slow_interval), max(1, args.jobs)).run()
+
+
+# ----------------------------------------------------------------------------
+# Snapshots / contact sheet (stdlib only: raw screencap + tiny PNG codec)
+# ----------------------------------------------------------------------------
+
+def png_encode(w: int, h: int, rgba: bytes) -> bytes:
+    """Encode 8-bit RGBA pixels as PNG (filter type 0 on every row)."""
+    stride = w * 4
+    raw = b"".join(b"\x00" + rgba[y * stride:(y + 1) * stride] for y in range(h))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+
+
+def png_decode_own(data: bytes) -> tuple[int, int, bytes] | None:
+    """Decode PNGs written by png_encode (RGBA, unfiltered rows); None for anything else."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    pos, idat, hdr = 8, [], None
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b"IHDR":
+            hdr = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            idat.append(body)
+        pos += 12 + length
+    if not hdr or hdr[2:] != (8, 6, 0, 0, 0):
+        return None
+    w, h = hdr[0], hdr[1]
+    try:
+        raw = zlib.decompress(b"".join(idat))
+    except zlib.error:
+        return None
+    stride = w * 4 + 1
+    if len(raw) != stride * h or any(raw[y * stride] for y in range(h)):
+        return None
+    return w, h, b"".join(raw[y * stride + 1:(y + 1) * stride] for y in range(h))
+
+
+def screencap_thumb(serial: str, width: int) -> tuple[int, int, bytes] | None:
+    """Stream a raw screencap via exec-out and downscale it to ~width px on the host.
+
+    Raw frames (header + RGBA) need no image decoder. The frame is read from the
+    pipe one row at a time and only every step-th row/pixel is kept (memoryview
+    slicing, so it runs at C speed); memory per capture stays about one thumbnail
+    whatever the screen size.
+    """
+    cmd = [*adb_base(serial), "exec-out", "screencap"]
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        COMMAND_METRICS.observe_run(cmd, time.perf_counter() - t0, 127)
+        return None
+    thumb = None
+    try:
+        thumb = _read_raw_frame(proc.stdout, width)
+    finally:
+        if thumb is None:
+            proc.kill()  # not a raw frame (or interrupted): don't drain the rest
+        proc.stdout.close()
+        code = proc.wait()
+    COMMAND_METRICS.observe_run(cmd, time.perf_counter() - t0, code)
+    return thumb if code == 0 else None
+
+
+def _read_raw_frame(stream, width: int) -> tuple[int, int, bytes] | None:
+    """Downscale a raw screencap frame read from stream; None if it isn't one."""
+    head = stream.read(12)
+    if len(head) < 12:
+        return None
+    w, h, fmt = struct.unpack("<III", head)
+    if not w or not h or fmt not in (1, 2, 5):  # RGBA_8888, RGBX_8888, BGRA_8888
+        return None
+    row = w * 4
+    step = max(1, w // width)
+    tw, th = len(range(0, w, step)), len(range(0, h, step))
+    # The header is 12 bytes, or 16 with a dataspace word (Android 9+); only the total
+    # length tells. Rows are read on the 12-byte grid and both candidates are sampled:
+    # a 16-byte-header row is this chunk from byte 4 plus the next chunk's first pixel.
+    rows12, rows16 = bytearray(), bytearray()
+    need_tail = (w - 1) % step == 0  # last pixel of a 16-byte row is sampled
+    total = 0
+    y = 0
+    waiting = False
+    while True:
+        chunk = stream.read(row)
+        if not chunk:
+            break
+        total += len(chunk)
+        if waiting:
+            if need_tail:
+                rows16 += chunk[:4]
+            waiting = False
+        if y % step == 0 and y < h and len(chunk) == row:
+            px = memoryview(chunk)
+            rows12 += px.cast("I")[::step].tobytes()
+            rows16 += px[4:].cast("I")[::step].tobytes()
+            waiting = True
+        y += 1
+    if total == h * row:
+        out = rows12
+    elif total == h * row + 4 and len(rows16) == tw * th * 4:
+        out = rows16
+    else:
+        return None
+    if fmt == 5:
+        out[0::4], out[2::4] = out[2::4], out[0::4]
+    if fmt in (2, 5):
+        out[3::4] = b"\xff" * (tw * th)
+    return tw, th, bytes(out)
+
+
+# 3x5 bitmap digits for tile numbers on the contact sheet
+_DIGITS = ["111101101101111", "010110010010111", "111001111100111", "111001111001111", "101101111001001",
+           "111100111001111", "111100111101111", "111001001001001", "111101111101111", "111101111001111"]
+
+
+def badge_size(num: int, scale: int = 3) -> tuple[int, int]:
+    return (len(str(num)) * 4 + 1) * scale, 7 * scale
+
+
+def _draw_number(canvas: bytearray, cw: int, x0: int, y0: int, num: int, box: tuple[int, int], scale: int = 3):
+    """Draw num's badge at (x0, y0), clipped to a box (w, h) so it never spills into other cells."""
+    text = str(num)
+    bw, bh = badge_size(num, scale)
+    bw, bh = min(bw, box[0]), min(bh, box[1])
+    for y in range(y0, y0 + bh):  # black badge
+        canvas[(y * cw + x0) * 4:(y * cw + x0 + bw) * 4] = b"\x00\x00\x00\xff" * bw
+    for i, ch in enumerate(text):
+        bits = _DIGITS[int(ch)]
+        for r in range(5):
+            for c in range(3):
+                if bits[r * 3 + c] == "1":
+                    x = x0 + (i * 4 + 1 + c) * scale
+                    w = min(scale, x0 + bw - x)
+                    for dy in range(scale):
+                        y = y0 + (r + 1) * scale + dy
+                        if w > 0 and y < y0 + bh:
+                            canvas[(y * cw + x) * 4:(y * cw + x + w) * 4] = b"\xff\xff\xff\xff" * w
+
+
+def contact_sheet(tiles: list[tuple[int, int, bytes] | None], cols: int, pad: int = 8) -> tuple[int, int, bytes]:
+    """Lay thumbnails out on a grid; tile i is numbered i+1 (missing tiles stay blank)."""
+    # Cells are at least as big as the largest Id badge, so numbers stay readable on tiny tiles
+    bw, bh = badge_size(len(tiles))
+    cell_w = max(bw, max((t[0] for t in tiles if t), default=1))
+    cell_h = max(bh, max((t[1] for t in tiles if t), default=1))
+    rows = math.ceil(len(tiles) / cols)
+    cw, ch = cols * (cell_w + pad) + pad, rows * (cell_h + pad) + pad
+    canvas = bytearray(b"\x20\x20\x20\xff" * (cw * ch))
+    for i, tile in enumerate(tiles):
+        x0 = pad + (i % cols) * (cell_w + pad)
+        y0 = pad + (i // cols) * (cell_h + pad)
+        if tile:
+            tw, th, px = tile
+            for y in range(th):
+                canvas[((y0 + y) * cw + x0) * 4:((y0 + y) * cw + x0 + tw) * 4] = px[y * tw * 4:(y + 1) * tw * 4]
+        _draw_number(canvas, cw, x0, y0, i + 1, (cell_w, cell_h))
+    return cw, ch, bytes(canvas)
+
+
+def _snapshot_one(rec: dict, thumb_path: Path, width: int, max_age: float) -> tuple[str, tuple[int, int, bytes] | None]:
+    """Return ("cached"|"new"|"failed", thumbnail)."""
+    if thumb_path.exists() and time.time() - thumb_path.stat().st_mtime < max_age:
+        cached = png_decode_own(thumb_path.read_bytes())
+        if cached:
+            return "cached", cached
+    ep = rec["endpoint"]
+    if not ensure_connected(ep):
+        return "failed", None
+    thumb = screencap_thumb(ep, width)
+    if not thumb:
+        return "failed", None
+    thumb_path.write_bytes(png_encode(*thumb))
+    return "new", thumb
+
+
+def cmd_snapshot(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py snapshot", description="Screenshot many devices at once into a contact sheet.")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("-o", "--out", default=DIR_SNAPSHOTS, help=f"output directory (default {DIR_SNAPSHOTS})")
+    parser.add_argument("-w", "--width", type=int, default=240, help="approximate thumbnail width in px (default 240)")
+    parser.add_argument("--max-age", type=float, default=60, help="reuse thumbnails younger than this many seconds (default 60; 0 = always refresh)")
+    parser.add_argument("--cols", type=int, default=0, help="contact sheet columns (default: square-ish grid)")
+    parser.add_argument("-j", "--jobs", type=int, default=64, help="max concurrent captures (default 64)")
+    args = parser.parse_args(argv or [])
+
+    print(Colors.c("=== Fleet snapshot / contact sheet ===", Colors.H1))
+    targets = select_targets(args.devices if args.devices or not argv else "all")
+    if not targets:
+        print("No devices selected.")
+        return
+    out_dir = Path(args.out)
+    thumbs_dir = out_dir / "thumbs"
+    thumbs_dir.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.monotonic()
+    jobs = max(1, min(args.jobs, len(targets)))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(
+            lambda t: _snapshot_one(t, thumbs_dir / f"{safe_filename(t['endpoint'])}.png", max(16, args.width), args.max_age),
+            targets))
+    wall = time.monotonic() - t0
+
+    cols = args.cols if args.cols > 0 else math.ceil(math.sqrt(len(targets)))
+    sheet_path = out_dir / "contact_sheet.png"
+    if any(thumb for _status, thumb in results):
+        sheet_path.write_bytes(png_encode(*contact_sheet([thumb for _status, thumb in results], cols)))
+
+    print()
+    print(" No  Endpoint           Model                  Thumb")
+    print(" --  -----------------  ---------------------- -------")
+    for i, (rec, (status, _thumb)) in enumerate(zip(targets, results), start=1):
+        color = {"new": Colors.NOTE, "cached": Colors.INFO}.get(status, Colors.ERR)
+        print(f" {i:<2}  {rec['endpoint'][:17]:<17}  {(rec.get('model') or '')[:22]:<22} {Colors.c(status, color)}")
+    fresh = sum(1 for st, _ in results if st == "new")
+    print()
+    print(f"{fresh} captured, {sum(1 for st, _ in results if st == 'cached')} cached, "
+          f"{sum(1 for st, _ in results if st == 'failed')} failed in {wall:.1f}s")
+    if any(thumb for _status, thumb in results):
+        print(f'Contact sheet: "{sheet_path}" (tiles numbered as above); thumbnails in "{thumbs_dir}"')
+    else:
+        print(Colors.c("[WARN]", Colors.WARN), f'No screenshots captured; "{sheet_path}" not written.')
+
+
+# ----------------------------------------------------------------------------
+# Multiplexed logcat (one asyncio event loop for every device)
+# ----------------------------------------------------------------------------
+
+# threadtime format: "10-19 06:31:02.123  1234  1234 I Tag: msg"
+LOGCAT_TS_RE = re.compile(rb"^(\d\d-\d\d \d\d:\d\d:\d\d\.\d{3})\s")
+
+
+class RotatingLog:
+    """Size-rotated log file: logcat.log -> logcat.1.log[.gz] ... logcat.<keep>.log[.gz]."""
+
+    def __init__(self, directory: Path, max_bytes: int, keep: int, compress: bool):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.dir = directory
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.compress = compress
+        self.path = directory / "logcat.log"
+        self.fh = open(self.path, "ab")
+        self.size = self.fh.tell()
+        self.rotations = 0
+
+    def _name(self, n: int) -> Path:
+        return self.dir / (f"logcat.{n}.log.gz" if self.compress else f"logcat.{n}.log")
+
+    def write(self, data: bytes) -> Path | None:
+        """Append data; returns the just-rotated file when a rotation happened."""
+        self.fh.write(data)
+        self.size += len(data)
+        if self.size < self.max_bytes:
+            return None
+        self.fh.close()
+        self._name(self.keep).unlink(missing_ok=True)
+        for n in range(self.keep - 1, 0, -1):
+            if self._name(n).exists():
+                self._name(n).replace(self._name(n + 1))
+        rotated = self.dir / "logcat.1.log"
+        self.path.replace(rotated)
+        self.fh = open(self.path, "ab")
+        self.size = 0
+        self.rotations += 1
+        return rotated if self.compress else None
+
+    def close(self):
+        self.fh.close()
+
+
+def gzip_file(path: Path):
+    """Compress path to path.gz and remove the original (runs off the event loop)."""
+    with open(path, "rb") as src, gzip.open(path.with_name(path.name + ".gz"), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+
+
+class LogcatStream:
+    """One device's logcat: reader -> bounded queue -> writer, resumed by timestamp on drops."""
+
+    def __init__(self, endpoint: str, label: str, log: RotatingLog, extra: list[str], backlog: bool,
+                 queue_lines: int, echo: bool):
+        self.endpoint = endpoint
+        self.label = label
+        self.log = log
+        self.extra = extra
+        self.backlog = backlog
+        self.echo = echo
+        # Bounded: when the writer falls behind, the reader stops draining adb's pipe
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_lines)
+        self.last_ts: bytes | None = None
+        self.same_ts = 0  # lines already written carrying last_ts (skipped on resume)
+        self.lines = 0
+        self.reconnects = 0
+
+    def _argv(self) -> list[str]:
+        cmd = [*adb_base(self.endpoint), "logcat", "-v", "threadtime"]
+        if self.last_ts:
+            cmd += ["-T", self.last_ts.decode()]  # resume from where the stream dropped
+        elif not self.backlog:
+            cmd += ["-T", "1"]  # start at the tail instead of dumping the whole buffer
+        return cmd + self.extra
+
+    async def read_loop(self, stop: asyncio.Event):
+        loop = asyncio.get_running_loop()
+        first = True
+        while not stop.is_set():
+            if not first:
+                self.reconnects += 1
+                tprint(Colors.c(self.label, Colors.DIM), Colors.c("stream dropped; reconnecting", Colors.WARN))
+                await asyncio.sleep(2)
+                if not await loop.run_in_executor(None, ensure_connected, self.endpoint):
+                    continue
+            first = False
+            resume_ts, skip = self.last_ts, self.same_ts
+            proc = await asyncio.create_subprocess_exec(
+                *self._argv(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+            try:
+                while not stop.is_set():
+                    line = await proc.stdout.readline()
+                    if not line:
+                        break
+                    if resume_ts is not None and line.startswith(b"--------- "):
+                        continue  # "beginning of <buffer>" banner repeats on every restart
+                    m = LOGCAT_TS_RE.match(line)
+                    if m:
+                        ts = m.group(1)
+                        if resume_ts is not None:
+                            # -T is inclusive: drop what we already have from before the drop
+                            if ts < resume_ts or (ts == resume_ts and skip > 0):
+                                skip -= ts == resume_ts
+                                continue
+                            resume_ts = None
+                        if ts == self.last_ts:
+                            self.same_ts += 1
+                        else:
+                            self.last_ts, self.same_ts = ts, 1
+                    await self.queue.put(line)
+            finally:
+                if proc.returncode is None:
+                    proc.terminate()
+                await proc.wait()
+
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await self.queue.get()
+            if line is None:
+                break
+            self.lines += 1
+            rotated = self.log.write(line)
+            if rotated:
+                # Off-loop, but awaited so this device's rotations stay ordered
+                await loop.run_in_executor(None, gzip_file, rotated)
+            if self.echo:
+                tprint(Colors.c(self.label, Colors.DIM), line.decode(errors="ignore").rstrip("\r\n"))
+
+
+async def _logcat_main(streams: list[LogcatStream], duration: float | None):
+    stop = asyncio.Event()
+    writers = [asyncio.create_task(s.write_loop()) for s in streams]
+    readers = [asyncio.create_task(s.read_loop(stop)) for s in streams]
+    try:
+        if duration:
+            await asyncio.sleep(duration)
+        else:
+            await asyncio.gather(*readers)
+    finally:
+        stop.set()
+        for t in readers:
+            t.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        for s in streams:
+            await s.queue.put(None)
+        await asyncio.gather(*writers, return_exceptions=True)
+
+
+def cmd_logcat(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py logcat", description="Stream logcat from many devices into rotating files.",
+                                     epilog="logcat filter specs go after --, e.g. logcat -d 1-4 -- ActivityManager:I *:W")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("-o", "--out", default=DIR_LOGCAT, help=f"output directory (default {DIR_LOGCAT})")
+    parser.add_argument("--max-mb", type=float, default=10, help="rotate a device's log at this size in MB (default 10)")
+    parser.add_argument("--keep", type=int, default=5, help="rotated files to keep per device (default 5)")
+    parser.add_argument("-z", "--compress", action="store_true", help="gzip rotated files")
+    parser.add_argument("--buffer", type=int, default=2000, help="max queued lines per device before backpressure (default 2000)")
+    parser.add_argument("--backlog", action="store_true", help="also save what is already in the device log buffer")
+    parser.add_argument("--echo", action="store_true", help="also print lines to the console, prefixed by device")
+    parser.add_argument("-t", "--duration", type=float, help="stop after this many seconds (default: until Ctrl+C)")
+    argv = list(argv or [])
+    extra = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = parser.parse_args(argv[:argv.index("--")] if "--" in argv else argv)
+
+    print(Colors.c("=== Multiplexed logcat ===", Colors.H1))
+    targets = select_targets(args.devices if args.devices or not argv else "all")
+    if not targets:
+        print("No devices selected.")
+        return
+    out_dir = Path(args.out)
+    labels = device_labels(targets)
+    streams = [
+        LogcatStream(t["endpoint"], labels[t["endpoint"]],
+                     RotatingLog(out_dir / safe_filename(t["endpoint"]), int(args.max_mb * (1 << 20)), max(1, args.keep), args.compress),
+                     extra, args.backlog, max(1, args.buffer), args.echo)
+        for t in targets
+    ]
+    print(Colors.c("[LOGCAT]", Colors.INFO), f"{len(streams)} device(s) -> \"{out_dir}\"  (Ctrl+C to stop)")
+    try:
+        asyncio.run(_logcat_main(streams, args.duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for s in streams:
+            s.log.close()
+
+    print()
+    print(" No  Endpoint           Lines     Rotations  Reconnects")
+    print(" --  -----------------  --------  ---------  ----------")
+    for i, st in enumerate(streams, start=1):
+        print(f" {i:<2}  {st.endpoint[:17]:<17}  {st.lines:>8}  {st.log.rotations:>9}  {st.reconnects:>10}")
+
+
+# ----------------------------------------------------------------------------
+# Metrics daemon (Prometheus text format over local HTTP)
+# ----------------------------------------------------------------------------
+
+def _prom_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class FleetCollector:
+    """Keeps per-device health up to date in the background; scrapes only read the cache.
+
+    Each tick costs one `adb devices` per server plus a TCP probe per endpoint;
+    battery is refreshed on a slower cadence and only for online devices. With
+    reconnect, dropped endpoints get an `adb connect` at most once per backoff
+    period (RECONNECT_BACKOFF, doubling per failed attempt).
+    """
+
+    STATES = ("device", "offline", "unauthorized", "missing")
+
+    def __init__(self, rows: list[dict], interval: float, slow_interval: float, jobs: int, reconnect: bool):
+        self.rows = rows
+        self.interval = interval
+        self.slow_interval = slow_interval
+        self.jobs = jobs
+        self.reconnect = reconnect
+        self._retry: dict[str, tuple[float, float]] = {}  # endpoint -> (next attempt, current backoff)
+        self._lock = threading.Lock()
+        self.devices = {r["endpoint"]: {"model": r.get("model") or "", "server": server_label(server_of(r["endpoint"])),
+                                        "state": "missing", "battery": None, "rtt": None,
+                                        "reconnects": 0, "last_seen": None} for r in rows}
+        self.collect_secs = 0.0
+        self.collections = 0
+
+    def _tick(self, pool: ThreadPoolExecutor, slow: bool):
+        eps = list(self.devices)
+        states = device_states()  # owner-aware: a stale row on another server must not win
+        if self.reconnect:
+            self._reconnect(pool, [ep for ep in eps if ":" in ep], states)
+        rtts = dict(zip(eps, pool.map(tcp_rtt_ms, eps)))
+        live = [ep for ep in eps if states.get(ep) == "device"]
+        batts = dict(zip(live, pool.map(lambda ep: parse_battery(adb_shell(ep, "dumpsys", "battery")), live))) if slow else {}
+        now = time.time()
+        with self._lock:
+            for ep in eps:
+                d = self.devices[ep]
+                state = states.get(ep, "missing")
+                if state == "device":
+                    if d["state"] != "device" and d["last_seen"] is not None:
+                        d["reconnects"] += 1  # came back after being seen before
+                    d["last_seen"] = now
+                d["state"] = state
+                d["rtt"] = rtts.get(ep)
+                if batts.get(ep):
+                    d["battery"] = int(batts[ep])
+
+    def _reconnect(self, pool: ThreadPoolExecutor, eps: list[str], states: dict[str, str]):
+        now = time.monotonic()
+        for ep in eps:
+            if states.get(ep) == "device":
+                self._retry.pop(ep, None)
+        due = [ep for ep in eps if states.get(ep) != "device" and now >= self._retry.get(ep, (0.0, 0.0))[0]]
+        # One connect round per tick, longest-waiting first; the rest stay due for the next one
+        due = sorted(due, key=lambda ep: self._retry.get(ep, (0.0, 0.0))[0])[:self.jobs]
+        first, cap = RECONNECT_BACKOFF
+        for ep, ok in zip(due, pool.map(ensure_connected, due)):
+            if ok:
+                states[ep] = "device"
+                self._retry.pop(ep, None)
+            else:
+                backoff = min(cap, self._retry[ep][1] * 2) if ep in self._retry else first
+                self._retry[ep] = (time.monotonic() + backoff, backoff)
+
+    def run(self, stop: threading.Event):
+        last_slow = 0.0
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while not stop.is_set():
+                t0 = time.monotonic()
+                slow = t0 - last_slow >= self.slow_interval
+                try:
+                    self._tick(pool, slow)
+                except Exception as exc:  # keep serving the last good values
+                    tprint(Colors.c("[METRICS]", Colors.ERR), f"collection failed: {exc}")
+                if slow:
+                    last_slow = t0
+                with self._lock:
+                    self.collect_secs = time.monotonic() - t0
+                    self.collections += 1
+                stop.wait(max(0.0, self.interval - (time.monotonic() - t0)))
+
+    def render(self) -> str:
+        out: list[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            devs = [(ep, dict(d)) for ep, d in self.devices.items()]
+            collect_secs, collections = self.collect_secs, self.collections
+        lbl = {ep: f'endpoint="{_prom_label(ep)}",model="{_prom_label(d["model"])}",server="{_prom_label(d["server"])}"' for ep, d in devs}
+
+        family("wifi_adb_device_up", "gauge", "1 if the device is in adb state \"device\".")
+        out += [f"wifi_adb_device_up{{{lbl[ep]}}} {int(d['state'] == 'device')}" for ep, d in devs]
+        family("wifi_adb_device_state", "gauge", "Current adb state (one-hot).")
+        for ep, d in devs:
+            cur = d["state"] if d["state"] in self.STATES else "offline"
+            out += [f'wifi_adb_device_state{{{lbl[ep]},state="{st}"}} {int(st == cur)}' for st in self.STATES]
+        family("wifi_adb_device_battery_percent", "gauge", "Battery level reported by dumpsys battery.")
+        out += [f"wifi_adb_device_battery_percent{{{lbl[ep]}}} {d['battery']}" for ep, d in devs if d["battery"] is not None]
+        family("wifi_adb_device_link_rtt_seconds", "gauge", "TCP handshake time to the device's adb endpoint.")
+        out += [f"wifi_adb_device_link_rtt_seconds{{{lbl[ep]}}} {d['rtt'] / 1000:.6f}" for ep, d in devs if d["rtt"] is not None]
+        family("wifi_adb_device_reconnects_total", "counter", "Times the device returned to \"device\" after dropping.")
+        out += [f"wifi_adb_device_reconnects_total{{{lbl[ep]}}} {d['reconnects']}" for ep, d in devs]
+        family("wifi_adb_device_last_seen_timestamp_seconds", "gauge", "Unix time the device was last seen online.")
+        out += [f"wifi_adb_device_last_seen_timestamp_seconds{{{lbl[ep]}}} {d['last_seen']:.3f}" for ep, d in devs if d["last_seen"]]
+
+        hist, fails = COMMAND_METRICS.snapshot()
+        family("wifi_adb_command_duration_seconds", "histogram", "Latency of adb commands issued by the toolbox.")
+        for name, h in sorted(hist.items()):
+            c = f'cmd="{_prom_label(name)}"'
+            for le, count in zip(CommandMetrics.BUCKETS, h):
+                out.append(f'wifi_adb_command_duration_seconds_bucket{{{c},le="{le}"}} {count}')
+            out.append(f'wifi_adb_command_duration_seconds_bucket{{{c},le="+Inf"}} {h[len(CommandMetrics.BUCKETS)]}')
+            out.append(f"wifi_adb_command_duration_seconds_sum{{{c}}} {h[-1]:.6f}")
+            out.append(f"wifi_adb_command_duration_seconds_count{{{c}}} {h[len(CommandMetrics.BUCKETS)]}")
+        family("wifi_adb_command_failures_total", "counter", "adb commands that failed at the adb/transport level.")
+        out += [f'wifi_adb_command_failures_total{{cmd="{_prom_label(n)}"}} {v}' for n, v in sorted(fails.items())]
+        family("wifi_adb_collect_duration_seconds", "gauge", "Wall time of the last background collection.")
+        out.append(f"wifi_adb_collect_duration_seconds {collect_secs:.6f}")
+        family("wifi_adb_collections_total", "counter", "Background collections completed.")
+        out.append(f"wifi_adb_collections_total {collections}")
+        return "\n".join(out) + "\n"
+
+
+def metrics_handler(collector: FleetCollector):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collector.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # scrapes every few seconds would flood the console
+
+    return Handler
+
+
+def cmd_metrics(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="wifi_adb.py metrics", description="Serve Prometheus metrics for the fleet and the toolbox.")
+    parser.add_argument("-d", "--devices", help='selection: "all", Ids like 1,3,5-7, or text (serial/model/ip)')
+    parser.add_argument("--bind", default="127.0.0.1", help="listen address (default 127.0.0.1)")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_METRICS_PORT, help=f"listen port (default {DEFAULT_METRICS_PORT})")
+    parser.add_argument("-i", "--interval", type=float, default=5.0, help="state/RTT collection interval in seconds (default 5)")
+    parser.add_argument("--slow-interval", type=float, default=60.0, help="battery collection interval in seconds (default 60)")
+    parser.add_argument("-j", "--jobs", type=int, default=16, help="max concurrent probes (default 16)")
+    parser.add_argument("--reconnect", action="store_true",
+                        help=f"`adb connect` dropped endpoints, with per-endpoint backoff ({RECONNECT_BACKOFF[0]}s doubling to {RECONNECT_BACKOFF[1]}s)")
+    args = parser.parse_args(argv or [])
+
+    print(Colors.c("=== Metrics daemon ===", Colors.H1))
+    targets = select_targets(args.devices or "all")
+    if not targets:
+        return
+    collector = FleetCollector(targets, max(0.5, args.interval), max(1.0, args.slow_interval), max(1, args.jobs), args.reconnect)
+    stop = threading.Event()
+    threading.Thread(target=collector.run, args=(stop,), daemon=True).start()
+    try:
+        server = http.server.ThreadingHTTPServer((args.bind, args.port), metrics_handler(collector))
+    except OSError as exc:
+        print(Colors.c("[ERROR]", Colors.ERR), f"cannot listen on {args.bind}:{args.port}: {exc}")
+        stop.set()
+        return
+    print(Colors.c("[METRICS]", Colors.INFO), f"{len(targets)} device(s); serving http://{args.bind}:{args.port}/metrics  (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+# ----------------------------------------------------------------------------
+# Background pre-warming (opt-in: `wifi_adb.py --prewarm`)
+# ----------------------------------------------------------------------------
+
+def parse_timestamp(ts: str) -> datetime:
+    """Parse timestamp_now() output; unparseable values sort oldest."""
+    try:
+        return datetime.strptime(ts, "%a %m/%d/%Y %H:%M:%S.%f")
+    except (TypeError, ValueError):
+        return datetime.min
+
+
+def recent_endpoints(count: int) -> list[str]:
+    """Inventory endpoints ordered by most recent setup/connect timestamp."""
+    newest: dict[str, datetime] = {}
+    for path in (Path(FILE_SETUP), Path(FILE_CONN)):
+        for it in load_json_flexible(path):
+            ep = it.get("endpoint") or ""
+            if ":" in ep:
+                ts = parse_timestamp(it.get("timestamp") or "")
+                newest[ep] = max(ts, newest.get(ep, datetime.min))
+    return sorted(newest, key=newest.get, reverse=True)[:count]
+
+
+class Prewarmer:
+    """Connects recent endpoints and caches device_props + stay-awake probe in the background."""
+
+    def __init__(self, count: int = PREWARM_COUNT, jobs: int = PREWARM_JOBS, ttl: float = PREWARM_TTL):
+        self.count = count
+        self.jobs = jobs
+        self.ttl = ttl
+        self.cache: dict[str, dict] = {}
+        self._warming: dict[str, threading.Event] = {}  # endpoint -> set when its warm-up ends
+        self._lock = threading.Lock()
+
+    def start(self):
+        # Daemon thread: never delays the menu and dies with it
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            list(pool.map(self._warm, recent_endpoints(self.count)))
+
+    def _warm(self, endpoint: str):
+        with self._lock:
+            self._warming[endpoint] = threading.Event()  # only once its warm-up actually starts
+        entry = None
+        try:
+            if ensure_connected(endpoint):
+                info = device_props(endpoint)
+                # Empty props mean the link dropped mid-probe; don't let later connects trust them
+                if info.get("model"):
+                    entry = {"info": info, "stay_ok": check_stay_awake_support(endpoint), "at": time.monotonic()}
+        except Exception:
+            pass  # best effort; the normal connect path still works
+        with self._lock:
+            if entry:
+                self.cache[endpoint] = entry
+            done = self._warming.pop(endpoint, None)
+        if done:
+            done.set()
+
+    def busy(self, endpoint: str) -> bool:
+        """True while endpoint's warm-up is running (don't disconnect it underneath the probes)."""
+        with self._lock:
+            return endpoint in self._warming
+
+    def get(self, endpoint: str) -> dict | None:
+        with self._lock:
+            pending = self._warming.get(endpoint)
+        if pending:
+            print(Colors.c("[WARM]", Colors.DIM), f"waiting up to {PREWARM_WAIT}s for background warm-up of {endpoint} ...")
+            if not pending.wait(PREWARM_WAIT):
+                return None
+        with self._lock:
+            entry = self.cache.get(endpoint)
+        if not entry or time.monotonic() - entry["at"] > self.ttl:
+            return None
+        return entry if adb_get_state(endpoint) == "device" else None
+
+
+_prewarmer: Prewarmer | None = None
+
+
+def prewarmed(endpoint: str) -> dict | None:
+    """Cached {info, stay_ok} for a warm, still-connected endpoint (None otherwise)."""
+    return _prewarmer.get(endpoint) if _prewarmer else None
+
+
+def prewarming(endpoint: str) -> bool:
+    """True if the pre-warmer is still probing endpoint."""
+    return bool(_prewarmer and _prewarmer.busy(endpoint))
 
 
 # ----------------------------------------------------------------------------
@@ -861,12 +2928,22 @@ def cmd_pair():
 
 def main():
     os.chdir(Path(__file__).resolve().parent)
-    ensure_adb()
 
     # Route via CLI arg if present
     arg = sys.argv[1].lower() if len(sys.argv) > 1 else ""
+    prewarm = False
+    # Leading global options: --prewarm, --servers host:port[,host:port...]
+    while arg in ("--prewarm", "--servers"):
+        if arg == "--prewarm":
+            prewarm = True
+            del sys.argv[1]
+        else:
+            ADB_SERVERS[:] = [x.strip() for x in (sys.argv[2] if len(sys.argv) > 2 else "").split(",") if x.strip()]
+            del sys.argv[1:3]
+        arg = sys.argv[1].lower() if len(sys.argv) > 1 else ""
     if arg in ("help", "-h", "--help"):
         arg = ""
+    ensure_adb()
 
     if arg == "setup":
         cmd_setup()
@@ -886,10 +2963,38 @@ def main():
     if arg == "pair":
         cmd_pair()
         return
+    if arg == "exec":
+        cmd_exec(sys.argv[2:])
+        return
+    if arg == "push":
+        cmd_push(sys.argv[2:])
+        return
+    if arg == "install":
+        cmd_install(sys.argv[2:])
+        return
+    if arg == "dashboard":
+        cmd_dashboard(sys.argv[2:])
+        return
+    if arg == "mirror":
+        cmd_mirror(sys.argv[2:])
+        return
+    if arg == "snapshot":
+        cmd_snapshot(sys.argv[2:])
+        return
+    if arg == "logcat":
+        cmd_logcat(sys.argv[2:])
+        return
+    if arg == "metrics":
+        cmd_metrics(sys.argv[2:])
+        return
 
     # Interactive menu
+    if prewarm:
+        global _prewarmer
+        _prewarmer = Prewarmer()
+        _prewarmer.start()
     while True:
-        os.system("cls" if os.name == "nt" else "clear")
+        clear_screen()
         bar()
         print(Colors.c("   A D B   W i - F i   T o o l b o x", Colors.TITLE))
         bar()
@@ -899,6 +3004,10 @@ def main():
         print(f"  {Colors.c('[4]', Colors.NUM)} {Colors.c('USB-Back All     ', Colors.LBL)} {Colors.c(': Switch all TCP devices back to USB', Colors.DIM)}")
         print(f"  {Colors.c('[5]', Colors.NUM)} {Colors.c('Disconnect All   ', Colors.LBL)} {Colors.c(': adb disconnect (all endpoints)', Colors.DIM)}")
         print(f"  {Colors.c('[6]', Colors.NUM)} {Colors.c('Pair             ', Colors.LBL)} {Colors.c(': Wireless debugging pairing (Android 11+)', Colors.DIM)}")
+        print(f"  {Colors.c('[7]', Colors.NUM)} {Colors.c('Exec             ', Colors.LBL)} {Colors.c(': Run a shell command on many devices in parallel', Colors.DIM)}")
+        print(f"  {Colors.c('[8]', Colors.NUM)} {Colors.c('Push             ', Colors.LBL)} {Colors.c(': Copy a file to many devices in parallel', Colors.DIM)}")
+        print(f"  {Colors.c('[9]', Colors.NUM)} {Colors.c('Install          ', Colors.LBL)} {Colors.c(': Install an APK on many devices in parallel', Colors.DIM)}")
+        print(f"  {Colors.c('[D]', Colors.NUM)} {Colors.c('Dashboard        ', Colors.LBL)} {Colors.c(': Live device table; connect or mirror from it', Colors.DIM)}")
         print(f"  {Colors.c('[0]', Colors.NUM)} {Colors.c('Exit             ', Colors.LBL)}")
         bar()
         choice = ask(Colors.c("Choose: ", Colors.ASK))
@@ -920,6 +3029,17 @@ def main():
         elif choice == "6":
             cmd_pair()
             press_enter("\nPress Enter to return to the menu...")
+        elif choice == "7":
+            cmd_exec()
+            press_enter("\nPress Enter to return to the menu...")
+        elif choice == "8":
+            cmd_push()
+            press_enter("\nPress Enter to return to the menu...")
+        elif choice == "9":
+            cmd_install()
+            press_enter("\nPress Enter to return to the menu...")
+        elif choice.lower() == "d":
+            cmd_dashboard()
         elif choice == "0":
             break
 